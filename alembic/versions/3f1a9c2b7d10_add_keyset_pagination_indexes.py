@@ -0,0 +1,39 @@
+"""add keyset pagination indexes
+
+Revision ID: 3f1a9c2b7d10
+Revises:
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1a9c2b7d10"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Backward index scans satisfy ORDER BY created_at DESC, id DESC
+    op.create_index(
+        "ix_jobs_user_id_created_at_id",
+        "jobs",
+        ["user_id", "created_at", "id"],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_scripts_user_id_created_at_id",
+        "scripts",
+        ["user_id", "created_at", "id"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_scripts_user_id_created_at_id", table_name="scripts", if_exists=True)
+    op.drop_index("ix_jobs_user_id_created_at_id", table_name="jobs", if_exists=True)
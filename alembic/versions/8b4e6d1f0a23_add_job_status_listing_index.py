@@ -0,0 +1,31 @@
+"""add job status listing index
+
+Revision ID: 8b4e6d1f0a23
+Revises: 3f1a9c2b7d10
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8b4e6d1f0a23"
+down_revision: Union[str, None] = "3f1a9c2b7d10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_jobs_user_id_status_created_at",
+        "jobs",
+        ["user_id", "status", "created_at"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_user_id_status_created_at", table_name="jobs", if_exists=True)
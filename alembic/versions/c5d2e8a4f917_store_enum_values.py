@@ -0,0 +1,54 @@
+"""store enum values instead of member names
+
+Revision ID: c5d2e8a4f917
+Revises: 8b4e6d1f0a23
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5d2e8a4f917"
+down_revision: Union[str, None] = "8b4e6d1f0a23"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ENUM_VALUES = {
+    "jobstatus": ("pending", "running", "completed", "failed", "timeout", "killed"),
+    "userrole": ("user", "admin"),
+}
+
+
+def _rename_label(type_name: str, old: str, new: str) -> None:
+    # Skip labels that are already renamed, e.g. on a freshly created schema
+    op.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM pg_enum e
+                JOIN pg_type t ON t.oid = e.enumtypid
+                WHERE t.typname = '{type_name}' AND e.enumlabel = '{old}'
+            ) THEN
+                ALTER TYPE {type_name} RENAME VALUE '{old}' TO '{new}';
+            END IF;
+        END
+        $$;
+        """
+    )
+
+
+def upgrade() -> None:
+    for type_name, values in ENUM_VALUES.items():
+        for value in values:
+            _rename_label(type_name, value.upper(), value)
+
+
+def downgrade() -> None:
+    for type_name, values in ENUM_VALUES.items():
+        for value in values:
+            _rename_label(type_name, value, value.upper())
@@ -0,0 +1,45 @@
+"""notify workers when jobs are inserted
+
+Revision ID: e7a3b9c1d204
+Revises: c5d2e8a4f917
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e7a3b9c1d204"
+down_revision: Union[str, None] = "c5d2e8a4f917"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Workers LISTEN on this channel instead of polling an empty queue
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_job_inserted() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('jobs_new', NEW.id::text);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute("DROP TRIGGER IF EXISTS jobs_notify_insert ON jobs")
+    op.execute(
+        """
+        CREATE TRIGGER jobs_notify_insert
+        AFTER INSERT ON jobs
+        FOR EACH ROW EXECUTE FUNCTION notify_job_inserted()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS jobs_notify_insert ON jobs")
+    op.execute("DROP FUNCTION IF EXISTS notify_job_inserted()")
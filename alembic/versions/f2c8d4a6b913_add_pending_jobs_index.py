@@ -0,0 +1,42 @@
+"""add partial index for pending jobs
+
+Revision ID: f2c8d4a6b913
+Revises: e7a3b9c1d204
+Create Date: 2026-10-15 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2c8d4a6b913"
+down_revision: Union[str, None] = "e7a3b9c1d204"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction, and avoids locking
+    # out job inserts while the index builds
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_jobs_pending_created_at",
+            "jobs",
+            ["created_at"],
+            postgresql_where=sa.text("status = 'pending'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_jobs_pending_created_at",
+            table_name="jobs",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -3,11 +3,16 @@
 from fastapi import APIRouter, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Annotated
 from fastapi import Depends
 
 from app.api.deps import DbSession
-from app.core.security import create_access_token, hash_password, verify_password
+from app.core.security import (
+    create_access_token,
+    hash_password_async,
+    verify_and_update_password_async,
+)
 from app.models.user import User
 from app.schemas.auth import LoginRequest, TokenResponse
 from app.schemas.user import UserCreate, UserResponse
@@ -31,11 +36,10 @@ async def register(user_data: UserCreate, db: DbSession) -> User:
     # Create new user
     user = User(
         email=user_data.email,
-        password_hash=hash_password(user_data.password),
+        password_hash=await hash_password_async(user_data.password),
     )
     db.add(user)
     await db.commit()
-    await db.refresh(user)
 
     return user
 
@@ -50,7 +54,7 @@ async def login(
     result = await db.execute(select(User).where(User.email == form_data.username))
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(form_data.password, user.password_hash):
+    if not user or not await _authenticate(db, user, form_data.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -69,7 +73,7 @@ async def login_json(credentials: LoginRequest, db: DbSession) -> TokenResponse:
     result = await db.execute(select(User).where(User.email == credentials.email))
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(credentials.password, user.password_hash):
+    if not user or not await _authenticate(db, user, credentials.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -78,3 +82,14 @@ async def login_json(credentials: LoginRequest, db: DbSession) -> TokenResponse:
     access_token = create_access_token(data={"sub": str(user.id)})
 
     return TokenResponse(access_token=access_token)
+
+
+async def _authenticate(db: AsyncSession, user: User, password: str) -> bool:
+    """Check a user's password, upgrading a stale hash on success."""
+    valid, new_hash = await verify_and_update_password_async(
+        password, user.password_hash
+    )
+    if valid and new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+    return valid
@@ -1,15 +1,25 @@
 """Job management endpoints."""
 
+from datetime import datetime
 from typing import List
 
 from fastapi import APIRouter, HTTPException, Query, status
-from sqlalchemy import select
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import delete, func, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import CurrentUser, DbSession
 from app.models.job import Job, JobStatus
 from app.models.script import Script
 from app.schemas.job import JobListResponse, JobResponse, JobSubmit
 from app.services.table_service import TableService
+from worker.data_handler import SYSTEM_TABLES as _RAW_SYSTEM_TABLES
+
+# Lowercased once at import for O(1) membership checks per request
+_SYSTEM_TABLES = frozenset(t.lower() for t in _RAW_SYSTEM_TABLES)
+
+# Largest log window returned by a single /logs request (characters)
+LOG_WINDOW_CHARS = 64 * 1024
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
@@ -25,45 +35,57 @@ async def submit_job(
 
     The job will be queued for processing by the worker.
     """
-    # Validate script exists and belongs to user
-    result = await db.execute(
-        select(Script).where(
-            Script.id == job_data.script_id,
-            Script.user_id == current_user.id,
+    # Validate table names before touching the database
+    if not TableService.is_valid_table_name(job_data.source_table):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Source table '{job_data.source_table}' not found",
         )
-    )
-    script = result.scalar_one_or_none()
 
-    if not script:
+    # Check destination doesn't conflict with system tables
+    if job_data.destination_table.lower() in _SYSTEM_TABLES:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Script not found",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot use system table name as destination",
         )
 
-    # Validate source table exists
-    table_service = TableService(db)
-    tables = await table_service.list_tables()
-
-    if job_data.source_table not in tables:
+    if not TableService.is_valid_table_name(job_data.destination_table):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Source table '{job_data.source_table}' not found",
+            detail="Invalid destination table name. Use alphanumeric characters and underscores, starting with a letter.",
         )
 
-    # Validate destination table name
-    if not table_service.is_valid_table_name(job_data.destination_table):
+    # The worker streams the source through an open cursor while writing,
+    # so replacing the same table would wait on its own read lock forever
+    if job_data.destination_table == job_data.source_table:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid destination table name. Use alphanumeric characters and underscores, starting with a letter.",
+            detail="Destination table must differ from the source table",
         )
 
-    # Check destination doesn't conflict with system tables
-    from worker.data_handler import SYSTEM_TABLES
+    # Validate script ownership and source table existence in one round trip
+    result = await db.execute(
+        select(
+            Script.id,
+            TableService.table_exists_clause(job_data.source_table),
+        ).where(
+            Script.id == job_data.script_id,
+            Script.user_id == current_user.id,
+        )
+    )
+    row = result.one_or_none()
 
-    if job_data.destination_table.lower() in SYSTEM_TABLES:
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Script not found",
+        )
+
+    _, source_exists = row
+    if not source_exists:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot use system table name as destination",
+            detail=f"Source table '{job_data.source_table}' not found",
         )
 
     # Create job
@@ -73,10 +95,13 @@ async def submit_job(
         source_table=job_data.source_table,
         destination_table=job_data.destination_table,
         status=JobStatus.PENDING,
+        # Set explicitly so the response needs no post-commit refresh
+        error_message=None,
+        started_at=None,
+        completed_at=None,
     )
     db.add(job)
     await db.commit()
-    await db.refresh(job)
 
     return job
 
@@ -85,20 +110,34 @@ async def submit_job(
 async def list_jobs(
     db: DbSession,
     current_user: CurrentUser,
-    skip: int = Query(default=0, ge=0),
+    before: datetime | None = Query(default=None),
+    before_id: int | None = Query(default=None),
     limit: int = Query(default=50, ge=1, le=100),
     status_filter: JobStatus | None = Query(default=None, alias="status"),
-) -> List[Job]:
-    """List all jobs for the current user."""
+) -> List[JobListResponse]:
+    """
+    List all jobs for the current user, newest first.
+
+    Paginate by passing the created_at and id of the last job on the
+    previous page as before and before_id.
+    """
     query = select(Job).where(Job.user_id == current_user.id)
 
     if status_filter:
         query = query.where(Job.status == status_filter)
 
-    query = query.order_by(Job.created_at.desc()).offset(skip).limit(limit)
+    if before is not None:
+        if before_id is not None:
+            query = query.where(
+                tuple_(Job.created_at, Job.id) < tuple_(before, before_id)
+            )
+        else:
+            query = query.where(Job.created_at < before)
+
+    query = query.order_by(Job.created_at.desc(), Job.id.desc()).limit(limit)
 
     result = await db.execute(query)
-    return list(result.scalars().all())
+    return [JobListResponse.from_orm_fast(row) for row in result.scalars()]
 
 
 @router.get("/{job_id}", response_model=JobResponse)
@@ -122,17 +161,36 @@ async def get_job(
     return job
 
 
-@router.get("/{job_id}/logs")
+@router.get("/{job_id}/logs", response_model=None)
 async def get_job_logs(
     job_id: int,
     db: DbSession,
     current_user: CurrentUser,
-) -> dict:
-    """Get job execution logs."""
+    tail: int = Query(default=LOG_WINDOW_CHARS, ge=1, le=LOG_WINDOW_CHARS),
+    offset: int | None = Query(default=None, ge=0),
+    output_format: str = Query(default="json", alias="format", pattern="^(json|raw)$"),
+) -> dict | PlainTextResponse:
+    """
+    Get job execution logs.
+
+    Returns at most ``tail`` characters: the end of the log by default, or
+    the window starting at ``offset`` when given (for incremental polling).
+    Slicing happens in SQL so large logs never leave the database whole.
+    Use ``format=raw`` to get the log text as plain text.
+    """
+    log_length = func.coalesce(func.length(Job.logs), 0)
+    if offset is None:
+        start = func.greatest(log_length - tail + 1, 1)
+    else:
+        start = offset + 1
+
     result = await db.execute(
-        select(Job.logs, Job.error_message, Job.status).where(
-            Job.id == job_id, Job.user_id == current_user.id
-        )
+        select(
+            func.substr(Job.logs, start, tail),
+            log_length,
+            Job.error_message,
+            Job.status,
+        ).where(Job.id == job_id, Job.user_id == current_user.id)
     )
     row = result.one_or_none()
 
@@ -142,12 +200,21 @@ async def get_job_logs(
             detail="Job not found",
         )
 
-    logs, error_message, status = row
+    logs, total_length, error_message, job_status = row
+    logs = logs or ""
+
+    if output_format == "raw":
+        return PlainTextResponse(logs)
+
+    window_start = total_length - len(logs) if offset is None else offset
 
     return {
         "job_id": job_id,
-        "status": status.value,
-        "logs": logs or "",
+        "status": job_status,
+        "logs": logs,
+        "offset": window_start,
+        "total_length": total_length,
+        "truncated": len(logs) < total_length,
         "error_message": error_message,
     }
 
@@ -159,24 +226,31 @@ async def cancel_job(
     current_user: CurrentUser,
 ) -> dict:
     """Cancel a pending or running job."""
+    # Atomically flip the status; only pending/running jobs match
     result = await db.execute(
-        select(Job).where(Job.id == job_id, Job.user_id == current_user.id)
-    )
-    job = result.scalar_one_or_none()
-
-    if not job:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Job not found",
+        update(Job)
+        .where(
+            Job.id == job_id,
+            Job.user_id == current_user.id,
+            Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]),
         )
+        .values(status=JobStatus.KILLED)
+        .returning(Job.id)
+    )
 
-    if job.status not in [JobStatus.PENDING, JobStatus.RUNNING]:
+    if result.first() is None:
+        # Nothing updated: tell a missing job apart from a finished one
+        job_status = await _get_job_status(db, job_id, current_user.id)
+        if job_status is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found",
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Cannot cancel job in {job.status.value} status",
+            detail=f"Cannot cancel job in {job_status} status",
         )
 
-    job.status = JobStatus.KILLED
     await db.commit()
 
     return {"message": "Job cancellation requested", "job_id": job_id}
@@ -189,23 +263,37 @@ async def delete_job(
     current_user: CurrentUser,
 ) -> None:
     """Delete a job record (does not delete destination table)."""
+    # Only allow deleting completed/failed jobs
     result = await db.execute(
-        select(Job).where(Job.id == job_id, Job.user_id == current_user.id)
-    )
-    job = result.scalar_one_or_none()
-
-    if not job:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Job not found",
+        delete(Job)
+        .where(
+            Job.id == job_id,
+            Job.user_id == current_user.id,
+            Job.status.notin_([JobStatus.PENDING, JobStatus.RUNNING]),
         )
+        .returning(Job.id)
+    )
 
-    # Only allow deleting completed/failed jobs
-    if job.status in [JobStatus.PENDING, JobStatus.RUNNING]:
+    if result.first() is None:
+        job_status = await _get_job_status(db, job_id, current_user.id)
+        if job_status is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found",
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete pending or running job. Cancel it first.",
         )
 
-    await db.delete(job)
     await db.commit()
+
+
+async def _get_job_status(
+    db: AsyncSession, job_id: int, user_id: int
+) -> JobStatus | None:
+    """Get a job's status, or None if the user has no such job."""
+    result = await db.execute(
+        select(Job.status).where(Job.id == job_id, Job.user_id == user_id)
+    )
+    return result.scalar_one_or_none()
@@ -1,9 +1,10 @@
 """Script CRUD endpoints."""
 
+from datetime import datetime
 from typing import List
 
 from fastapi import APIRouter, HTTPException, Query, status
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 
 from app.api.deps import CurrentUser, DbSession
 from app.models.script import Script
@@ -27,7 +28,6 @@ async def create_script(
     )
     db.add(script)
     await db.commit()
-    await db.refresh(script)
     return script
 
 
@@ -35,18 +35,30 @@ async def create_script(
 async def list_scripts(
     db: DbSession,
     current_user: CurrentUser,
-    skip: int = Query(default=0, ge=0),
+    before: datetime | None = Query(default=None),
+    before_id: int | None = Query(default=None),
     limit: int = Query(default=50, ge=1, le=100),
-) -> List[Script]:
-    """List all scripts for the current user."""
-    result = await db.execute(
-        select(Script)
-        .where(Script.user_id == current_user.id)
-        .order_by(Script.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-    )
-    return list(result.scalars().all())
+) -> List[ScriptResponse]:
+    """
+    List all scripts for the current user, newest first.
+
+    Paginate by passing the created_at and id of the last script on the
+    previous page as before and before_id.
+    """
+    query = select(Script).where(Script.user_id == current_user.id)
+
+    if before is not None:
+        if before_id is not None:
+            query = query.where(
+                tuple_(Script.created_at, Script.id) < tuple_(before, before_id)
+            )
+        else:
+            query = query.where(Script.created_at < before)
+
+    query = query.order_by(Script.created_at.desc(), Script.id.desc()).limit(limit)
+
+    result = await db.execute(query)
+    return [ScriptResponse.from_orm_fast(row) for row in result.scalars()]
 
 
 @router.get("/{script_id}", response_model=ScriptResponse)
@@ -101,7 +113,6 @@ async def update_script(
         setattr(script, field, value)
 
     await db.commit()
-    await db.refresh(script)
     return script
 
 
@@ -37,8 +37,7 @@ async def get_table_info(
         )
 
     # Check if table exists
-    tables = await service.list_tables()
-    if table_name not in tables:
+    if not await service.table_exists(table_name):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Table '{table_name}' not found",
@@ -62,8 +61,7 @@ async def get_table_schema(
             detail="Invalid table name",
         )
 
-    tables = await service.list_tables()
-    if table_name not in tables:
+    if not await service.table_exists(table_name):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Table '{table_name}' not found",
@@ -88,8 +86,7 @@ async def preview_table(
             detail="Invalid table name",
         )
 
-    tables = await service.list_tables()
-    if table_name not in tables:
+    if not await service.table_exists(table_name):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Table '{table_name}' not found",
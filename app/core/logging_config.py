@@ -1,17 +1,36 @@
 """Logging configuration with rotating file handlers."""
 
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import List, Tuple
 
 from app.config import get_settings
 
 settings = get_settings()
 
 
-def setup_logging() -> None:
-    """Configure application logging with rotating file handlers."""
+def _queued(*handlers: logging.Handler) -> Tuple[QueueHandler, QueueListener]:
+    """
+    Wrap handlers behind an in-memory queue drained by a background thread.
+
+    The returned QueueHandler only enqueues records, so the caller (e.g. the
+    event loop) never blocks on stream writes or file rollover.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    return QueueHandler(log_queue), listener
+
+
+def setup_logging() -> List[QueueListener]:
+    """
+    Configure application logging with rotating file handlers.
+
+    Returns:
+        Started queue listeners; stop them on shutdown to flush pending records
+    """
     log_dir = Path(settings.LOG_DIR)
     log_dir.mkdir(exist_ok=True)
 
@@ -29,7 +48,6 @@ def setup_logging() -> None:
         "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     )
     console_handler.setFormatter(console_format)
-    root_logger.addHandler(console_handler)
 
     # File handler for app.log
     file_format = logging.Formatter(
@@ -44,7 +62,9 @@ def setup_logging() -> None:
     )
     app_handler.setLevel(logging.DEBUG)
     app_handler.setFormatter(file_format)
-    root_logger.addHandler(app_handler)
+
+    root_queue_handler, root_listener = _queued(console_handler, app_handler)
+    root_logger.addHandler(root_queue_handler)
 
     # Sandbox-specific logger
     sandbox_logger = logging.getLogger("sandbox")
@@ -55,12 +75,19 @@ def setup_logging() -> None:
         encoding="utf-8",
     )
     sandbox_handler.setFormatter(file_format)
-    sandbox_logger.addHandler(sandbox_handler)
+
+    sandbox_queue_handler, sandbox_listener = _queued(sandbox_handler)
+    sandbox_logger.addHandler(sandbox_queue_handler)
 
     # Reduce noise from external libraries
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 
+    listeners = [root_listener, sandbox_listener]
+    for listener in listeners:
+        listener.start()
+    return listeners
+
 
 def setup_worker_logging() -> None:
     """Configure worker-specific logging."""
@@ -1,17 +1,35 @@
 """Security utilities for JWT and password hashing."""
 
-from datetime import datetime, timedelta
-from typing import Optional
-
+import asyncio
+import time
+from datetime import timedelta
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHash, VerificationError
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 
 from app.config import get_settings
 
 settings = get_settings()
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# JWT parameters, bound once at import to skip settings attribute access
+_SECRET = settings.JWT_SECRET_KEY
+_ALG = settings.JWT_ALGORITHM
+_ALGS = [_ALG]
+_EXPIRE_MINUTES = settings.JWT_EXPIRE_MINUTES
+
+# Decoded tokens are cached per 30-second bucket so repeated validation of
+# the same token (e.g. a polling client) skips the HMAC check
+_DECODE_BUCKET_SECONDS = 30
+
+# Password hashing: new hashes use argon2id; existing bcrypt hashes still
+# verify and are upgraded on the next successful login. Both libraries are
+# called directly rather than through a scheme-detecting wrapper.
+_argon2 = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=1)
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
 
 BCRYPT_MAX_PASSWORD_BYTES = 72
 
@@ -32,13 +50,68 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     except ValueError:
         # Password is too long to be valid for bcrypt
         return False
-    return pwd_context.verify(plain_password, hashed_password)
+
+    if hashed_password.startswith(_BCRYPT_PREFIXES):
+        try:
+            return bcrypt.checkpw(
+                plain_password.encode("utf-8"), hashed_password.encode("utf-8")
+            )
+        except ValueError:
+            return False
+
+    try:
+        return _argon2.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHash):
+        return False
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and return a replacement hash if the stored one is stale.
+
+    Returns:
+        Tuple of (valid, new_hash); new_hash is None unless the stored hash
+        uses a deprecated scheme or settings and should be replaced.
+    """
+    if not verify_password(plain_password, hashed_password):
+        return False, None
+
+    if hashed_password.startswith(_BCRYPT_PREFIXES) or _argon2.check_needs_rehash(
+        hashed_password
+    ):
+        return True, hash_password(plain_password)
+    return True, None
 
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt."""
+    """Hash a password using the preferred scheme (argon2id)."""
     _ensure_password_within_limit(password)
-    return pwd_context.hash(password)
+    return _argon2.hash(password)
+
+
+# Hashing is deliberately slow; these run it on a worker thread so async
+# endpoints don't block the event loop.
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password without blocking the event loop."""
+    return await asyncio.to_thread(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Verify a password and get an upgraded hash without blocking the event loop."""
+    return await asyncio.to_thread(
+        verify_and_update_password, plain_password, hashed_password
+    )
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password without blocking the event loop."""
+    return await asyncio.to_thread(hash_password, password)
 
 
 def create_access_token(
@@ -47,25 +120,32 @@ def create_access_token(
 ) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
-    expire = datetime.utcnow() + (
-        expires_delta or timedelta(minutes=settings.JWT_EXPIRE_MINUTES)
-    )
-    to_encode.update({"exp": expire})
-    return jwt.encode(
-        to_encode,
-        settings.JWT_SECRET_KEY,
-        algorithm=settings.JWT_ALGORITHM,
+    lifetime = (
+        int(expires_delta.total_seconds()) if expires_delta else _EXPIRE_MINUTES * 60
     )
+    to_encode["exp"] = int(time.time()) + lifetime
+    return jwt.encode(to_encode, _SECRET, algorithm=_ALG)
 
 
-def decode_token(token: str) -> Optional[dict]:
-    """Decode and validate a JWT token."""
+@lru_cache(maxsize=4096)
+def _decode_cached(token: str, exp_bucket: int) -> Optional[dict]:
+    """Decode a JWT; exp_bucket only scopes the cache entry in time."""
     try:
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM],
-        )
-        return payload
+        return jwt.decode(token, _SECRET, algorithms=_ALGS)
     except JWTError:
         return None
+
+
+def decode_token(token: str) -> Optional[dict]:
+    """Decode and validate a JWT token."""
+    now = time.time()
+    payload = _decode_cached(token, int(now) // _DECODE_BUCKET_SECONDS)
+    if payload is None:
+        return None
+
+    # A cached entry may outlive the token itself within its bucket
+    exp = payload.get("exp")
+    if exp is not None and exp <= now:
+        return None
+
+    return dict(payload)
@@ -7,7 +7,6 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.pool import NullPool
 
 from app.config import get_settings
 
@@ -17,10 +16,17 @@ settings = get_settings()
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
-    pool_size=10,
-    max_overflow=20,
+    pool_size=settings.POOL_SIZE,
+    max_overflow=settings.MAX_OVERFLOW,
     pool_pre_ping=True,
     pool_recycle=3600,
+    # Reuse compiled SQL strings and per-connection prepared statements so
+    # repeated queries (e.g. the job INSERT) skip compile and parse steps
+    query_cache_size=1200,
+    connect_args={
+        "prepared_statement_cache_size": 256,
+        "statement_cache_size": 1024,
+    },
 )
 
 # Session factory
@@ -17,11 +17,13 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Application lifespan handler for startup and shutdown."""
     # Startup
-    setup_logging()
+    app.state.log_listeners = setup_logging()
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
     yield
     # Shutdown
     logger.info("Shutting down application")
+    for listener in app.state.log_listeners:
+        listener.stop()
 
 
 app = FastAPI(
@@ -31,10 +33,10 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-# CORS middleware
+# CORS middleware (one precompiled pattern covers the local frontends)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://localhost:8080"],
+    allow_origin_regex=r"^http://localhost:(3000|8080)$",
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
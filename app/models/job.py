@@ -4,7 +4,18 @@ import enum
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    DDL,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -15,8 +26,12 @@ if TYPE_CHECKING:
     from app.models.script import Script
 
 
-class JobStatus(enum.Enum):
-    """Job status enumeration."""
+class JobStatus(str, enum.Enum):
+    """
+    Job status enumeration.
+
+    Members are also strings, so they serialize as their value directly.
+    """
 
     PENDING = "pending"
     RUNNING = "running"
@@ -25,11 +40,28 @@ class JobStatus(enum.Enum):
     TIMEOUT = "timeout"
     KILLED = "killed"
 
+    def __str__(self) -> str:
+        return self.value
+
 
 class Job(Base):
     """Job model for tracking transformation executions."""
 
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Serves keyset pagination (newest first) on the list endpoint
+        Index("ix_jobs_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Same, when the listing is filtered by status
+        Index("ix_jobs_user_id_status_created_at", "user_id", "status", "created_at"),
+        # Small, always-hot index for the worker's claim query
+        Index(
+            "ix_jobs_pending_created_at",
+            "created_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
+    # Fetch server defaults (id, created_at) via INSERT ... RETURNING
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(
@@ -41,7 +73,14 @@ class Job(Base):
     source_table: Mapped[str] = mapped_column(String(255), nullable=False)
     destination_table: Mapped[str] = mapped_column(String(255), nullable=False)
     status: Mapped[JobStatus] = mapped_column(
-        Enum(JobStatus), default=JobStatus.PENDING, nullable=False
+        Enum(
+            JobStatus,
+            name="jobstatus",
+            native_enum=True,
+            values_callable=lambda e: [member.value for member in e],
+        ),
+        default=JobStatus.PENDING,
+        nullable=False,
     )
     logs: Mapped[Optional[str]] = mapped_column(Text, default="", nullable=True)
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -59,3 +98,32 @@ class Job(Base):
     # Relationships
     owner: Mapped["User"] = relationship("User", back_populates="jobs")
     script: Mapped[Optional["Script"]] = relationship("Script", back_populates="jobs")
+
+
+# Announce new jobs to LISTENing workers. Same trigger as the notify
+# migration, so databases built with create_all get it too.
+event.listen(
+    Job.__table__,
+    "after_create",
+    DDL(
+        """
+        CREATE OR REPLACE FUNCTION notify_job_inserted() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('jobs_new', NEW.id::text);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Job.__table__,
+    "after_create",
+    DDL(
+        """
+        CREATE TRIGGER jobs_notify_insert
+        AFTER INSERT ON jobs
+        FOR EACH ROW EXECUTE FUNCTION notify_job_inserted()
+        """
+    ).execute_if(dialect="postgresql"),
+)
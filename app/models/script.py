@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -18,6 +18,12 @@ class Script(Base):
     """Script model for storing user transformation code."""
 
     __tablename__ = "scripts"
+    __table_args__ = (
+        # Serves keyset pagination (newest first) on the list endpoint
+        Index("ix_scripts_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+    # Fetch server defaults (id, created_at) via INSERT ... RETURNING
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(
@@ -35,4 +41,7 @@ class Script(Base):
 
     # Relationships
     owner: Mapped["User"] = relationship("User", back_populates="scripts")
-    jobs: Mapped[List["Job"]] = relationship("Job", back_populates="script")
+    # ON DELETE SET NULL on jobs.script_id detaches jobs without loading them
+    jobs: Mapped[List["Job"]] = relationship(
+        "Job", back_populates="script", passive_deletes=True
+    )
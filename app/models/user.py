@@ -15,17 +15,26 @@ if TYPE_CHECKING:
     from app.models.job import Job
 
 
-class UserRole(enum.Enum):
-    """User role enumeration."""
+class UserRole(str, enum.Enum):
+    """
+    User role enumeration.
+
+    Members are also strings, so they serialize as their value directly.
+    """
 
     USER = "user"
     ADMIN = "admin"
 
+    def __str__(self) -> str:
+        return self.value
+
 
 class User(Base):
     """User model for authentication."""
 
     __tablename__ = "users"
+    # Fetch server defaults (id, created_at) via INSERT ... RETURNING
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     email: Mapped[str] = mapped_column(
@@ -33,16 +42,30 @@ class User(Base):
     )
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
     role: Mapped[UserRole] = mapped_column(
-        Enum(UserRole), default=UserRole.USER, nullable=False
+        Enum(
+            UserRole,
+            name="userrole",
+            native_enum=True,
+            values_callable=lambda e: [member.value for member in e],
+        ),
+        default=UserRole.USER,
+        nullable=False,
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
 
-    # Relationships
+    # Relationships. Deleting a user leaves the children to the database's
+    # ON DELETE CASCADE rather than loading every row to delete it here.
     scripts: Mapped[List["Script"]] = relationship(
-        "Script", back_populates="owner", cascade="all, delete-orphan"
+        "Script",
+        back_populates="owner",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     jobs: Mapped[List["Job"]] = relationship(
-        "Job", back_populates="owner", cascade="all, delete-orphan"
+        "Job",
+        back_populates="owner",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
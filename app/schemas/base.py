@@ -0,0 +1,32 @@
+"""Shared base for response schemas built from ORM objects."""
+
+from typing import Any, ClassVar, Tuple
+
+from pydantic import BaseModel
+
+
+class ORMResponse(BaseModel):
+    """
+    Response schema that can be populated from an ORM instance.
+
+    ``from_orm_fast`` copies attributes straight into ``model_construct``,
+    skipping validation. Only use it for trusted objects loaded from the
+    database; client input must still go through normal validation.
+    """
+
+    model_config = {"from_attributes": True}
+
+    # Field names, computed once per subclass at class creation
+    _field_names: ClassVar[Tuple[str, ...]] = ()
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        cls._field_names = tuple(cls.model_fields)
+
+    @classmethod
+    def from_orm_fast(cls, obj: Any):
+        """Build an instance from an ORM object without validation."""
+        return cls.model_construct(
+            **{name: getattr(obj, name) for name in cls._field_names}
+        )
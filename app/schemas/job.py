@@ -6,6 +6,7 @@ from typing import Optional
 from pydantic import BaseModel, Field
 
 from app.models.job import JobStatus
+from app.schemas.base import ORMResponse
 
 
 class JobSubmit(BaseModel):
@@ -16,7 +17,7 @@ class JobSubmit(BaseModel):
     destination_table: str = Field(..., min_length=1, max_length=255)
 
 
-class JobResponse(BaseModel):
+class JobResponse(ORMResponse):
     """Job response schema with full details."""
 
     id: int
@@ -32,10 +33,8 @@ class JobResponse(BaseModel):
     completed_at: Optional[datetime]
     created_at: datetime
 
-    model_config = {"from_attributes": True}
 
-
-class JobListResponse(BaseModel):
+class JobListResponse(ORMResponse):
     """Job list response schema (summary)."""
 
     id: int
@@ -46,5 +45,3 @@ class JobListResponse(BaseModel):
     rows_processed: int
     created_at: datetime
     completed_at: Optional[datetime]
-
-    model_config = {"from_attributes": True}
@@ -5,6 +5,8 @@ from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from app.schemas.base import ORMResponse
+
 
 class ScriptCreate(BaseModel):
     """Script creation schema."""
@@ -22,7 +24,7 @@ class ScriptUpdate(BaseModel):
     code_text: Optional[str] = Field(None, min_length=1)
 
 
-class ScriptResponse(BaseModel):
+class ScriptResponse(ORMResponse):
     """Script response schema."""
 
     id: int
@@ -32,5 +34,3 @@ class ScriptResponse(BaseModel):
     code_text: str
     created_at: datetime
     updated_at: Optional[datetime]
-
-    model_config = {"from_attributes": True}
@@ -15,7 +15,11 @@ class ColumnInfo(BaseModel):
 
 
 class TableInfo(BaseModel):
-    """Table information schema."""
+    """
+    Table information schema.
+
+    ``row_count`` comes from planner statistics, so it is approximate.
+    """
 
     name: str
     row_count: int
@@ -23,10 +27,15 @@ class TableInfo(BaseModel):
 
 
 class TablePreview(BaseModel):
-    """Table preview schema."""
+    """
+    Table preview schema.
+
+    Rows are positional: each entry in ``data`` lists values in ``columns`` order.
+    ``total_rows`` is approximate for tables larger than the preview.
+    """
 
     table_name: str
     total_rows: int
     preview_rows: int
     columns: List[str]
-    data: List[dict[str, Any]]
+    data: List[List[Any]]
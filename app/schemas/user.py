@@ -6,6 +6,7 @@ from typing import Optional
 from pydantic import BaseModel, EmailStr, Field
 
 from app.models.user import UserRole
+from app.schemas.base import ORMResponse
 
 
 class UserCreate(BaseModel):
@@ -22,12 +23,10 @@ class UserUpdate(BaseModel):
     password: Optional[str] = Field(None, min_length=8, max_length=100)
 
 
-class UserResponse(BaseModel):
+class UserResponse(ORMResponse):
     """User response schema."""
 
     id: int
     email: str
     role: UserRole
     created_at: datetime
-
-    model_config = {"from_attributes": True}
@@ -1,11 +1,13 @@
 """Table introspection and data loading service."""
 
 import re
-from typing import Any, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
-from sqlalchemy import text
+from sqlalchemy import column, exists, select, table, text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.selectable import Exists
 
 from app.config import get_settings
 from app.schemas.table import ColumnInfo, TableInfo, TablePreview
@@ -13,7 +15,100 @@ from app.schemas.table import ColumnInfo, TableInfo, TablePreview
 settings = get_settings()
 
 # System tables to exclude from user table list
-SYSTEM_TABLES = {"users", "scripts", "jobs", "alembic_version"}
+SYSTEM_TABLES = frozenset({"users", "scripts", "jobs", "alembic_version"})
+
+# PostgreSQL system prefixes that user tables may not use
+_RESERVED_PREFIXES = ("pg_", "sql_", "information_schema")
+
+# Only allow alphanumeric and underscore, starting with letter, and reject
+# system tables and reserved prefixes in the same case-insensitive scan
+_VALID_TABLE_RE = re.compile(
+    r"^(?!(?:%s))(?!(?:%s)\Z)[A-Za-z][A-Za-z0-9_]{0,62}\Z"
+    % (
+        "|".join(map(re.escape, _RESERVED_PREFIXES)),
+        "|".join(map(re.escape, sorted(SYSTEM_TABLES))),
+    ),
+    re.IGNORECASE,
+)
+
+# Columns may also start with an underscore
+_COLUMN_NAME_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]{0,62}$")
+
+# Table metadata only changes on DDL, so cache it in-process for a while.
+# Public table list: (monotonic timestamp, names)
+_TABLES_CACHE: Optional[Tuple[float, Tuple[str, ...]]] = None
+# Column schemas by table name: (monotonic timestamp, columns)
+_SCHEMA_CACHE: Dict[str, Tuple[float, Tuple[ColumnInfo, ...]]] = {}
+_SCHEMA_CACHE_MAX = 128
+
+# Lightweight handles on pg_catalog for composable queries. The catalogs
+# are much cheaper to read than the information_schema views built on them.
+_pg_namespace = table(
+    "pg_namespace", column("oid"), column("nspname"), schema="pg_catalog"
+)
+_pg_class = table(
+    "pg_class",
+    column("relname"),
+    column("relnamespace"),
+    column("relkind"),
+    schema="pg_catalog",
+)
+
+# Ordinary and partitioned tables, i.e. information_schema's BASE TABLE
+_TABLE_RELKINDS = ("r", "p")
+
+# Columns of a public table in ordinal order. to_regclass() yields NULL, and
+# so no rows, for a table that does not exist. {extra} appends select items.
+_COLUMNS_QUERY = """
+    SELECT a.attname,
+           format_type(a.atttypid, a.atttypmod),
+           NOT a.attnotnull,
+           pg_get_expr(d.adbin, d.adrelid){extra}
+    FROM pg_catalog.pg_attribute a
+    LEFT JOIN pg_catalog.pg_attrdef d
+        ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+    WHERE a.attrelid = to_regclass(format('%I.%I', 'public', :table_name))
+    AND a.attnum > 0
+    AND NOT a.attisdropped
+    ORDER BY a.attnum
+"""
+
+# Planner's row estimate for a public table; -1 (or 0 before PostgreSQL 14)
+# until the table has been analyzed
+_ROW_ESTIMATE_QUERY = """
+    SELECT reltuples::bigint
+    FROM pg_catalog.pg_class
+    WHERE oid = to_regclass(format('%I.%I', 'public', :table_name))
+"""
+
+
+def invalidate_table_cache(table_name: Optional[str] = None) -> None:
+    """Drop cached table metadata for one table, or for all tables."""
+    global _TABLES_CACHE
+
+    _TABLES_CACHE = None
+    if table_name is None:
+        _SCHEMA_CACHE.clear()
+    else:
+        _SCHEMA_CACHE.pop(table_name, None)
+
+
+def _cached_schema(table_name: str) -> Optional[List[ColumnInfo]]:
+    """Return the cached schema for a table if it is still fresh."""
+    entry = _SCHEMA_CACHE.get(table_name)
+    if entry is None:
+        return None
+    if time.monotonic() - entry[0] >= settings.TABLE_CACHE_TTL_SECONDS:
+        del _SCHEMA_CACHE[table_name]
+        return None
+    return list(entry[1])
+
+
+def _store_schema(table_name: str, columns: List[ColumnInfo]) -> None:
+    """Cache a table schema, evicting the oldest entry when full."""
+    if table_name not in _SCHEMA_CACHE and len(_SCHEMA_CACHE) >= _SCHEMA_CACHE_MAX:
+        del _SCHEMA_CACHE[next(iter(_SCHEMA_CACHE))]
+    _SCHEMA_CACHE[table_name] = (time.monotonic(), tuple(columns))
 
 
 class TableService:
@@ -23,40 +118,69 @@ class TableService:
         self.db = db
 
     async def list_tables(self) -> List[str]:
-        """List all user data tables in the database."""
+        """
+        List all user data tables in the database.
+
+        Results are cached in-process for TABLE_CACHE_TTL_SECONDS, since
+        the table list only changes when tables are created or dropped.
+        """
+        global _TABLES_CACHE
+
+        now = time.monotonic()
+        if (
+            _TABLES_CACHE is not None
+            and now - _TABLES_CACHE[0] < settings.TABLE_CACHE_TTL_SECONDS
+        ):
+            return list(_TABLES_CACHE[1])
+
         query = text("""
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_type = 'BASE TABLE'
-            ORDER BY table_name
+            SELECT c.relname
+            FROM pg_catalog.pg_class c
+            JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = 'public'
+            AND c.relkind IN ('r', 'p')
+            ORDER BY c.relname
         """)
         result = await self.db.execute(query)
-        tables = [row[0] for row in result.fetchall()]
         # Filter out system tables
-        return [t for t in tables if t not in SYSTEM_TABLES]
+        tables = tuple(
+            row[0] for row in result.fetchall() if row[0] not in SYSTEM_TABLES
+        )
+        _TABLES_CACHE = (now, tables)
+        return list(tables)
+
+    async def table_exists(self, table_name: str) -> bool:
+        """Check whether a user data table exists."""
+        if not self.is_valid_table_name(table_name):
+            return False
+
+        result = await self.db.execute(
+            select(self.table_exists_clause(table_name))
+        )
+        return bool(result.scalar())
 
     async def get_table_schema(self, table_name: str) -> List[ColumnInfo]:
-        """Get column information for a table."""
+        """Get column information for a table (cached like list_tables)."""
         if not self.is_valid_table_name(table_name):
             raise ValueError(f"Invalid table name: {table_name}")
 
-        query = text("""
-            SELECT column_name, data_type, is_nullable, column_default
-            FROM information_schema.columns
-            WHERE table_schema = 'public' AND table_name = :table_name
-            ORDER BY ordinal_position
-        """)
+        cached = _cached_schema(table_name)
+        if cached is not None:
+            return cached
+
+        query = text(_COLUMNS_QUERY.format(extra=""))
         result = await self.db.execute(query, {"table_name": table_name})
-        return [
+        columns = [
             ColumnInfo(
                 name=row[0],
                 type=row[1],
-                nullable=row[2] == "YES",
+                nullable=row[2],
                 default=row[3],
             )
             for row in result.fetchall()
         ]
+        _store_schema(table_name, columns)
+        return columns
 
     async def get_row_count(self, table_name: str) -> int:
         """Get total row count for a table."""
@@ -68,10 +192,63 @@ class TableService:
         result = await self.db.execute(query)
         return result.scalar() or 0
 
+    async def get_row_count_estimate(self, table_name: str) -> int:
+        """
+        Get an approximate row count from planner statistics.
+
+        Constant time regardless of table size, so prefer it wherever the
+        count is only displayed. Falls back to an exact count for tables
+        that have not been analyzed yet.
+        """
+        if not self.is_valid_table_name(table_name):
+            raise ValueError(f"Invalid table name: {table_name}")
+
+        result = await self.db.execute(
+            text(_ROW_ESTIMATE_QUERY), {"table_name": table_name}
+        )
+        estimate = result.scalar()
+        if estimate is None or estimate <= 0:
+            return await self.get_row_count(table_name)
+        return estimate
+
     async def get_table_info(self, table_name: str) -> TableInfo:
-        """Get table information including schema and row count."""
-        columns = await self.get_table_schema(table_name)
-        row_count = await self.get_row_count(table_name)
+        """
+        Get table information including schema and estimated row count.
+
+        With the schema cached only the estimate is queried; otherwise it
+        rides along as an uncorrelated subquery on the column query, so
+        either way it usually takes a single round trip.
+        """
+        if not self.is_valid_table_name(table_name):
+            raise ValueError(f"Invalid table name: {table_name}")
+
+        cached = _cached_schema(table_name)
+        if cached is not None:
+            row_count = await self.get_row_count_estimate(table_name)
+            return TableInfo(name=table_name, row_count=row_count, columns=cached)
+
+        query = text(
+            _COLUMNS_QUERY.format(extra=f",\n           ({_ROW_ESTIMATE_QUERY})")
+        )
+        result = await self.db.execute(query, {"table_name": table_name})
+        rows = result.fetchall()
+
+        if not rows or rows[0][4] is None or rows[0][4] <= 0:
+            # No columns, or not analyzed yet
+            row_count = await self.get_row_count(table_name)
+        else:
+            row_count = rows[0][4]
+
+        columns = [
+            ColumnInfo(
+                name=row[0],
+                type=row[1],
+                nullable=row[2],
+                default=row[3],
+            )
+            for row in rows
+        ]
+        _store_schema(table_name, columns)
         return TableInfo(name=table_name, row_count=row_count, columns=columns)
 
     async def preview_table(
@@ -84,21 +261,39 @@ class TableService:
         # Cap limit at 1000
         limit = min(limit, 1000)
 
-        # Get row count
-        total_rows = await self.get_row_count(table_name)
+        # Fetch the estimated row count alongside the preview rows in one
+        # round trip. The estimate is always the first column of the result.
+        query = text(f"""
+            WITH pv AS (SELECT * FROM "{table_name}" LIMIT :limit)
+            SELECT ({_ROW_ESTIMATE_QUERY}) AS _total_rows, pv.* FROM pv
+        """)
+        result = await self.db.execute(
+            query, {"limit": limit, "table_name": table_name}
+        )
+        columns = list(result.keys())[1:]
+        rows = result.fetchall()
+
+        if 0 < len(rows) == limit:
+            estimate = rows[0][0]
+            if estimate is None or estimate <= 0:
+                total_rows = await self.get_row_count(table_name)
+            else:
+                total_rows = max(estimate, limit)
+        elif limit > 0:
+            # Fewer rows than the limit means we have seen the whole table
+            total_rows = len(rows)
+        else:
+            total_rows = await self.get_row_count(table_name)
 
-        # Get preview data
-        query = text(f'SELECT * FROM "{table_name}" LIMIT :limit')
-        result = await self.db.execute(query, {"limit": limit})
-        columns = list(result.keys())
-        rows = [dict(zip(columns, row)) for row in result.fetchall()]
+        data = [list(row[1:]) for row in rows]
 
-        return TablePreview(
+        # Built from trusted database rows, so skip field validation
+        return TablePreview.model_construct(
             table_name=table_name,
             total_rows=total_rows,
-            preview_rows=len(rows),
+            preview_rows=len(data),
             columns=columns,
-            data=rows,
+            data=data,
         )
 
     async def load_table_chunk(
@@ -123,49 +318,51 @@ class TableService:
         return pd.DataFrame(rows, columns=columns)
 
     async def load_table_as_dataframe(self, table_name: str) -> pd.DataFrame:
-        """Load entire table as DataFrame."""
+        """
+        Load entire table as DataFrame.
+
+        The table is read through a single server-side cursor, fetched
+        CHUNK_SIZE rows at a time, instead of re-scanning it with OFFSET for
+        every page. Rows are converted to a DataFrame once at the end.
+        """
         if not self.is_valid_table_name(table_name):
             raise ValueError(f"Invalid table name: {table_name}")
 
-        row_count = await self.get_row_count(table_name)
-
-        # For large tables, use chunked loading
-        if row_count > settings.CHUNK_SIZE:
-            chunks = []
-            offset = 0
-            while offset < row_count:
-                chunk = await self.load_table_chunk(
-                    table_name, settings.CHUNK_SIZE, offset
-                )
-                if chunk.empty:
-                    break
-                chunks.append(chunk)
-                offset += settings.CHUNK_SIZE
-            return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
-        else:
-            return await self.load_table_chunk(table_name, row_count + 1, 0)
+        query = text(f'SELECT * FROM "{table_name}"').execution_options(
+            yield_per=settings.CHUNK_SIZE
+        )
+        result = await self.db.stream(query)
+        columns = list(result.keys())
+        rows: List[Any] = []
+        async for partition in result.partitions():
+            rows.extend(partition)
 
-    @staticmethod
-    def is_valid_table_name(name: str) -> bool:
-        """Validate table name to prevent SQL injection."""
-        # Only allow alphanumeric and underscore, starting with letter
-        pattern = r"^[a-zA-Z][a-zA-Z0-9_]{0,62}$"
-        if not re.match(pattern, name):
-            return False
+        if not rows:
+            return pd.DataFrame()
 
-        # Block system table names
-        if name.lower() in SYSTEM_TABLES:
-            return False
+        return pd.DataFrame(rows, columns=columns)
 
-        # Block PostgreSQL system prefixes
-        reserved_prefixes = ("pg_", "sql_", "information_schema")
-        if name.lower().startswith(reserved_prefixes):
-            return False
+    @staticmethod
+    def table_exists_clause(table_name: str) -> Exists:
+        """
+        Build an EXISTS clause that is true when a public data table exists.
 
-        return True
+        Lets callers fold the table lookup into a query they already issue,
+        saving a separate round trip.
+        """
+        return exists().where(
+            _pg_class.c.relnamespace == _pg_namespace.c.oid,
+            _pg_namespace.c.nspname == "public",
+            _pg_class.c.relkind.in_(_TABLE_RELKINDS),
+            _pg_class.c.relname == table_name,
+        )
+
+    @staticmethod
+    def is_valid_table_name(name: str) -> bool:
+        """Validate table name to prevent SQL injection."""
+        return _VALID_TABLE_RE.match(name) is not None
 
     @staticmethod
     def is_valid_column_name(name: str) -> bool:
         """Validate column name."""
-        pattern = r"^[a-zA-Z_][a-zA-Z0-9_]{0,62}$"
-        return bool(re.match(pattern, str(name)))
+        return bool(_COLUMN_NAME_RE.match(str(name)))
@@ -7,13 +7,11 @@ This script demonstrates cleaning null values in a DataFrame.
 
 def transform(df):
     """Clean null values: fill numeric with 0, strings with 'Unknown'."""
-    # Get column types
-    for col in df.columns:
-        if df[col].dtype in ["float64", "int64"]:
-            # Fill numeric nulls with 0
-            df[col] = df[col].fillna(0)
-        else:
-            # Fill string nulls with 'Unknown'
-            df[col] = df[col].fillna("Unknown")
+    # Split columns by type once, then fill each group in a single call
+    num_cols = df.select_dtypes(include=["number"]).columns
+    other_cols = df.columns.difference(num_cols, sort=False)
+
+    df[num_cols] = df[num_cols].fillna(0)
+    df[other_cols] = df[other_cols].fillna("Unknown")
 
     return df
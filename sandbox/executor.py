@@ -2,26 +2,40 @@
 Sandbox executor - launches and monitors subprocess for safe code execution.
 
 This implements Layers 2, 4, and 5 of the sandbox strategy:
-- Layer 2: Subprocess isolation (CREATE_NO_WINDOW, restricted env)
-- Layer 4: psutil monitoring (CPU, memory, timeout)
+- Layer 2: Subprocess isolation (CREATE_NO_WINDOW, restricted env),
+  one pre-started runner process per job
+- Layer 4: Resource limits (kernel rlimits on POSIX, psutil on Windows)
 - Layer 5: File system controls (isolated temp dir)
 """
 
 import logging
+import marshal
 import os
 import pickle
 import shutil
+import signal
 import subprocess
 import sys
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 import pandas as pd
 import psutil
 
+if os.name != "nt":
+    import resource
+
 from sandbox.restricted_compiler import RestrictedCompiler
+from sandbox.runner import (
+    INPUT_FRAME_FILE,
+    RESULT_FILE,
+    STDERR_FILE,
+    read_data_file,
+    write_data_file,
+)
+from sandbox.worker_pool import get_runner_pool
 
 # Get settings - import here to avoid circular imports in worker
 try:
@@ -30,13 +44,99 @@ try:
     settings = get_settings()
     SANDBOX_TIMEOUT = settings.SANDBOX_TIMEOUT_SECONDS
     SANDBOX_MAX_MEMORY = settings.SANDBOX_MAX_MEMORY_MB
+    SANDBOX_WARM_RUNNERS = settings.SANDBOX_WARM_RUNNERS
 except ImportError:
     # Fallback defaults if running standalone
     SANDBOX_TIMEOUT = 60
     SANDBOX_MAX_MEMORY = 512
+    SANDBOX_WARM_RUNNERS = 1
 
 logger = logging.getLogger("sandbox")
 
+# Path to runner script
+RUNNER_PATH = Path(__file__).parent / "runner.py"
+
+# Seconds between psutil samples where kernel limits are unavailable
+MONITOR_INTERVAL = 0.5
+
+
+def _resource_limits() -> List[Tuple[int, Tuple[int, int]]]:
+    """
+    Kernel resource limits for runner processes (POSIX only).
+
+    RLIMIT_DATA rather than RLIMIT_AS, since numpy's BLAS threads reserve
+    large amounts of address space they never touch.
+    """
+    memory_bytes = SANDBOX_MAX_MEMORY * 1024 * 1024
+    return [
+        (resource.RLIMIT_DATA, (memory_bytes, memory_bytes)),
+        # CPU time can never exceed wall time, so this only backs up the timeout
+        (resource.RLIMIT_CPU, (SANDBOX_TIMEOUT + 1, SANDBOX_TIMEOUT + 2)),
+    ]
+
+
+def _apply_resource_limits():
+    """Apply the limits in the child before exec, where prlimit() is missing."""
+    for limit, values in _resource_limits():
+        resource.setrlimit(limit, values)
+
+
+def _spawn_runner() -> subprocess.Popen:
+    """
+    Start a runner process that imports its dependencies and then waits
+    on stdin for a job.
+
+    The runner moves into the job's sandbox directory and redirects its
+    own stderr there once the job arrives.
+    """
+    # Prepare minimal environment
+    env = {
+        "PYTHONPATH": str(Path(__file__).parent.parent.absolute()),
+        "PYTHONHASHSEED": "0",
+        "PYTHONDONTWRITEBYTECODE": "1",
+    }
+
+    # Add essential Windows environment variables
+    if os.name == "nt":
+        for key in ["SYSTEMROOT", "TEMP", "TMP", "PATH"]:
+            if key in os.environ:
+                env[key] = os.environ[key]
+
+    # Windows-specific: CREATE_NO_WINDOW flag. Elsewhere the kernel
+    # enforces memory and CPU limits on the child. Runners are spawned
+    # from worker threads, where preexec_fn can deadlock the child, so the
+    # limits are set from outside with prlimit() wherever it exists.
+    creation_flags = 0
+    preexec_fn = None
+    if os.name == "nt":
+        creation_flags = subprocess.CREATE_NO_WINDOW
+    elif not hasattr(resource, "prlimit"):
+        preexec_fn = _apply_resource_limits
+
+    # Output goes to files, not pipes, so the child can never block on a
+    # full pipe buffer while we wait for it to exit
+    process = subprocess.Popen(
+        [sys.executable, str(RUNNER_PATH)],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env=env,
+        creationflags=creation_flags,
+        preexec_fn=preexec_fn,
+    )
+
+    # The runner only imports and waits on stdin until it gets a job, so
+    # no user code runs before the limits are in place
+    if os.name != "nt" and preexec_fn is None:
+        try:
+            for limit, values in _resource_limits():
+                resource.prlimit(process.pid, limit, values)
+        except Exception:
+            process.kill()
+            process.wait()
+            raise
+    return process
+
 
 class SandboxExecutor:
     """
@@ -46,14 +146,21 @@ class SandboxExecutor:
     1. RestrictedPython compilation (via RestrictedCompiler)
     2. Subprocess isolation with minimal environment
     3. Import allowlist (enforced by guards)
-    4. psutil monitoring for resource limits
+    4. Kernel rlimits (POSIX) or psutil monitoring (Windows) for resources
     5. Isolated working directory per job
     """
 
-    def __init__(self, job_id: int):
+    def __init__(self, job_id: int, slot: Optional[int] = None):
+        """
+        Args:
+            job_id: Job the executions belong to
+            slot: Distinguishes executors running one job's chunks at the
+                same time, so each gets its own sandbox directory
+        """
         self.job_id = job_id
         self.compiler = RestrictedCompiler()
-        self.sandbox_dir = Path(f"sandbox_temp/{job_id}")
+        suffix = "" if slot is None else f"-{slot}"
+        self.sandbox_dir = Path(f"sandbox_temp/{job_id}{suffix}")
         self.process: Optional[subprocess.Popen] = None
 
     def execute(
@@ -72,30 +179,86 @@ class SandboxExecutor:
             - result_df: Transformed DataFrame or None if failed
             - log_output: Execution logs for debugging
         """
+        logs = self._start_logs(df)
+
+        # Step 1: Compile code with RestrictedPython
+        self._log(logs, "Compiling code with RestrictedPython...")
+        prepared, error = self.prepare(code)
+
+        if error:
+            self._log(logs, f"COMPILATION ERROR: {error}")
+            return False, None, "\n".join(logs)
+
+        self._log(logs, "Code compiled successfully")
+        return self._run_prepared(prepared, df, logs)
+
+    def prepare(self, code: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Compile user code once so it can be run on many DataFrames.
+
+        Args:
+            code: User's transformation code
+
+        Returns:
+            Tuple of (prepared_code, error_message)
+            - prepared_code: Marshalled code object for run(), None on error
+            - error_message: None if successful, error string if failed
+        """
+        compiled_code, error = self.compiler.compile_code(code)
+        if error:
+            return None, error
+        # Code objects cannot be pickled, so they travel as marshal bytes.
+        # The runner builds the restricted globals itself.
+        return marshal.dumps(compiled_code), None
+
+    def run(
+        self, prepared: bytes, df: pd.DataFrame
+    ) -> Tuple[bool, Optional[pd.DataFrame], str]:
+        """
+        Execute code returned by prepare() on a DataFrame.
+
+        Args:
+            prepared: Prepared code from prepare()
+            df: Input DataFrame
+
+        Returns:
+            Same tuple as execute()
+        """
+        logs = self._start_logs(df)
+        return self._run_prepared(prepared, df, logs)
+
+    def cancel(self):
+        """
+        Kill the runner of an execution in progress, if any.
+
+        Safe to call from another thread; the run() in progress then
+        returns a failure instead of waiting out the timeout.
+        """
+        self._kill_process()
+
+    def _start_logs(self, df: pd.DataFrame) -> list:
+        """Start the log for one execution."""
         logs = []
         self._log(logs, f"Starting sandbox execution for job {self.job_id}")
         self._log(logs, f"Input DataFrame: {len(df)} rows, {len(df.columns)} columns")
+        return logs
 
+    def _run_prepared(
+        self, prepared: bytes, df: pd.DataFrame, logs: list
+    ) -> Tuple[bool, Optional[pd.DataFrame], str]:
+        """Run prepared code in a sandbox subprocess and clean up after it."""
         try:
-            # Step 1: Compile code with RestrictedPython
-            self._log(logs, "Compiling code with RestrictedPython...")
-            compiled_code, error = self.compiler.compile_code(code)
-
-            if error:
-                self._log(logs, f"COMPILATION ERROR: {error}")
-                return False, None, "\n".join(logs)
-
-            self._log(logs, "Code compiled successfully")
-
             # Step 2: Create isolated working directory
             self._setup_sandbox_dir()
             self._log(logs, f"Created sandbox directory: {self.sandbox_dir}")
 
-            # Step 3: Prepare input data
+            # Step 3: Prepare input data. The DataFrame goes through a file
+            # in the sandbox directory rather than the stdin pipe.
+            frame_bytes = self._write_input_frame(df)
+            self._log(logs, f"Wrote input DataFrame ({frame_bytes} bytes)")
             input_data = {
-                "code": compiled_code,
-                "dataframe": df,
-                "globals": self.compiler.get_restricted_globals(),
+                "code": prepared,
+                "dataframe_file": INPUT_FRAME_FILE,
             }
 
             # Step 4: Launch subprocess and monitor
@@ -109,49 +272,20 @@ class SandboxExecutor:
             return False, None, "\n".join(logs)
 
         finally:
-            # Step 5: Cleanup
+            # Step 5: Cleanup, then pre-start a runner for the next job
             self._cleanup_sandbox_dir()
+            get_runner_pool(_spawn_runner, SANDBOX_WARM_RUNNERS).refill()
 
     def _run_subprocess(
         self, input_data: dict, logs: list
     ) -> Tuple[bool, Optional[pd.DataFrame], str]:
         """Run the sandbox subprocess with monitoring."""
-
-        # Prepare minimal environment
-        env = {
-            "PYTHONPATH": str(Path(__file__).parent.parent.absolute()),
-            "PYTHONHASHSEED": "0",
-            "PYTHONDONTWRITEBYTECODE": "1",
-        }
-
-        # Add essential Windows environment variables
-        if os.name == "nt":
-            for key in ["SYSTEMROOT", "TEMP", "TMP", "PATH"]:
-                if key in os.environ:
-                    env[key] = os.environ[key]
-
-        # Windows-specific: CREATE_NO_WINDOW flag
-        creation_flags = 0
-        if os.name == "nt":
-            creation_flags = subprocess.CREATE_NO_WINDOW
-
-        # Path to runner script
-        runner_path = Path(__file__).parent / "runner.py"
-
-        self._log(logs, f"Launching subprocess: python {runner_path}")
-
-        self.process = subprocess.Popen(
-            [sys.executable, str(runner_path)],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            cwd=str(self.sandbox_dir),
-            env=env,
-            creationflags=creation_flags,
-        )
-
+        self.process = get_runner_pool(_spawn_runner, SANDBOX_WARM_RUNNERS).acquire()
+        self._log(logs, f"Acquired runner subprocess: python {RUNNER_PATH}")
         self._log(logs, f"Subprocess started (PID: {self.process.pid})")
 
+        input_data["workdir"] = str(self.sandbox_dir.absolute())
+
         # Send input data
         try:
             pickled_input = pickle.dumps(input_data)
@@ -170,8 +304,26 @@ class SandboxExecutor:
     def _monitor_process(
         self, logs: list
     ) -> Tuple[bool, Optional[pd.DataFrame], str]:
-        """Monitor subprocess for resource limits and timeout."""
-        start_time = time.time()
+        """Wait for the subprocess, enforcing the timeout and memory limit."""
+        self._log(logs, f"Monitoring process (timeout: {SANDBOX_TIMEOUT}s, memory limit: {SANDBOX_MAX_MEMORY}MB)")
+
+        if os.name != "nt":
+            # Memory and CPU are capped by rlimits, so just block until exit
+            try:
+                self.process.wait(timeout=SANDBOX_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                self._kill_process()
+                self._log(logs, f"KILLED: Timeout exceeded ({SANDBOX_TIMEOUT}s)")
+                return False, None, "\n".join(logs)
+            return self._handle_process_completion(logs)
+
+        return self._sample_process(logs)
+
+    def _sample_process(
+        self, logs: list
+    ) -> Tuple[bool, Optional[pd.DataFrame], str]:
+        """Poll memory usage with psutil where kernel limits are unavailable."""
+        deadline = time.monotonic() + SANDBOX_TIMEOUT
 
         try:
             ps_process = psutil.Process(self.process.pid)
@@ -179,39 +331,35 @@ class SandboxExecutor:
             self._log(logs, "WARNING: Process ended before monitoring started")
             return self._handle_process_completion(logs)
 
-        self._log(logs, f"Monitoring process (timeout: {SANDBOX_TIMEOUT}s, memory limit: {SANDBOX_MAX_MEMORY}MB)")
-
-        while self.process.poll() is None:
-            elapsed = time.time() - start_time
+        while True:
+            remaining = deadline - time.monotonic()
 
             # Check timeout
-            if elapsed > SANDBOX_TIMEOUT:
+            if remaining <= 0:
                 self._kill_process()
                 self._log(logs, f"KILLED: Timeout exceeded ({SANDBOX_TIMEOUT}s)")
                 return False, None, "\n".join(logs)
 
-            # Check resource usage
+            # Returns as soon as the process exits
             try:
-                memory_mb = ps_process.memory_info().rss / (1024 * 1024)
-                cpu_percent = ps_process.cpu_percent(interval=0.1)
-
-                # Check memory limit
-                if memory_mb > SANDBOX_MAX_MEMORY:
-                    self._kill_process()
-                    self._log(
-                        logs,
-                        f"KILLED: Memory limit exceeded ({memory_mb:.1f}MB > {SANDBOX_MAX_MEMORY}MB)",
-                    )
-                    return False, None, "\n".join(logs)
-
-                # Log high CPU usage (but don't kill - it's expected for computations)
-                if cpu_percent > 95 and elapsed > 5:
-                    self._log(logs, f"Note: High CPU usage ({cpu_percent}%)")
+                self.process.wait(timeout=min(MONITOR_INTERVAL, remaining))
+                break
+            except subprocess.TimeoutExpired:
+                pass
 
+            # Check memory limit
+            try:
+                memory_mb = ps_process.memory_info().rss / (1024 * 1024)
             except psutil.NoSuchProcess:
                 break  # Process ended
 
-            time.sleep(0.5)
+            if memory_mb > SANDBOX_MAX_MEMORY:
+                self._kill_process()
+                self._log(
+                    logs,
+                    f"KILLED: Memory limit exceeded ({memory_mb:.1f}MB > {SANDBOX_MAX_MEMORY}MB)",
+                )
+                return False, None, "\n".join(logs)
 
         return self._handle_process_completion(logs)
 
@@ -220,21 +368,25 @@ class SandboxExecutor:
     ) -> Tuple[bool, Optional[pd.DataFrame], str]:
         """Handle process completion and parse output."""
 
-        # Read output
-        stdout = self.process.stdout.read()
-        stderr = self.process.stderr.read()
+        # Read output. A runner that died before receiving the job never
+        # created its stderr file.
+        stderr_path = self.sandbox_dir / STDERR_FILE
+        stderr = stderr_path.read_bytes() if stderr_path.exists() else b""
 
         if stderr:
             stderr_text = stderr.decode("utf-8", errors="replace")
             self._log(logs, f"Stderr: {stderr_text}")
 
         if self.process.returncode != 0:
+            if os.name != "nt" and self.process.returncode == -signal.SIGXCPU:
+                self._log(logs, f"KILLED: CPU time limit exceeded ({SANDBOX_TIMEOUT}s)")
             self._log(logs, f"Process exited with code {self.process.returncode}")
             return False, None, "\n".join(logs)
 
         # Parse output
+        result_path = self.sandbox_dir / RESULT_FILE
         try:
-            response = pickle.loads(stdout)
+            response = read_data_file(result_path)
 
             if response.get("success"):
                 result_df = response["dataframe"]
@@ -254,7 +406,8 @@ class SandboxExecutor:
 
         except Exception as e:
             self._log(logs, f"ERROR: Failed to parse subprocess output: {e}")
-            self._log(logs, f"Raw output length: {len(stdout)} bytes")
+            if result_path.exists():
+                self._log(logs, f"Result file size: {result_path.stat().st_size} bytes")
             return False, None, "\n".join(logs)
 
     def _kill_process(self):
@@ -280,6 +433,15 @@ class SandboxExecutor:
             except Exception as e:
                 logger.warning(f"Error killing process: {e}")
 
+    def _write_input_frame(self, df: pd.DataFrame) -> int:
+        """
+        Write the input DataFrame to the sandbox directory for the runner.
+
+        Returns:
+            Size of the written file in bytes
+        """
+        return write_data_file(self.sandbox_dir / INPUT_FRAME_FILE, df)
+
     def _setup_sandbox_dir(self):
         """Create isolated sandbox directory."""
         self.sandbox_dir.mkdir(parents=True, exist_ok=True)
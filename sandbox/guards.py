@@ -16,7 +16,7 @@ ALLOWED_IMPORTS = {
 }
 
 # Blocked attributes across all objects (security-critical)
-BLOCKED_ATTRIBUTES = {
+BLOCKED_ATTRIBUTES = frozenset({
     # Class introspection
     "__class__",
     "__bases__",
@@ -50,10 +50,10 @@ BLOCKED_ATTRIBUTES = {
     "__aexit__",
     "__aiter__",
     "__anext__",
-}
+})
 
 # Safe dunder methods that are allowed
-SAFE_DUNDERS = {
+SAFE_DUNDERS = frozenset({
     "__len__",
     "__iter__",
     "__getitem__",
@@ -78,10 +78,10 @@ SAFE_DUNDERS = {
     "__neg__",
     "__pos__",
     "__abs__",
-}
+})
 
 # Blocked DataFrame methods (file I/O, network)
-BLOCKED_DF_METHODS = {
+BLOCKED_DF_METHODS = frozenset({
     # File output
     "to_pickle",
     "to_parquet",
@@ -111,7 +111,10 @@ BLOCKED_DF_METHODS = {
     "read_hdf",
     "read_clipboard",
     "read_xml",
-}
+})
+
+# Types whose I/O methods are blocked by guarded_getattr
+_PANDAS_TYPES = (pd.DataFrame, pd.Series)
 
 
 def guarded_getattr(obj, name):
@@ -123,18 +126,26 @@ def guarded_getattr(obj, name):
     - Access to DataFrame I/O methods
     - Access to code objects and globals
     """
+    # Fast path: public names, which are nearly every access in pandas code
+    if name[:1] != "_":
+        # Block DataFrame I/O operations
+        if name in BLOCKED_DF_METHODS and isinstance(obj, _PANDAS_TYPES):
+            raise AttributeError(
+                f"DataFrame.{name}() is not allowed - data output is handled by the system"
+            )
+        return default_guarded_getattr(obj, name)
+
     # Block all dunder attributes except safe ones
-    if name.startswith("_"):
-        if name.startswith("__") and name.endswith("__"):
-            if name not in SAFE_DUNDERS:
-                raise AttributeError(
-                    f"Access to '{name}' is not allowed for security reasons"
-                )
-        elif name.startswith("_"):
-            # Single underscore - private attributes blocked
+    if name.startswith("__") and name.endswith("__"):
+        if name not in SAFE_DUNDERS:
             raise AttributeError(
-                f"Access to private attribute '{name}' is not allowed"
+                f"Access to '{name}' is not allowed for security reasons"
             )
+    else:
+        # Single underscore - private attributes blocked
+        raise AttributeError(
+            f"Access to private attribute '{name}' is not allowed"
+        )
 
     # Block explicitly dangerous attributes
     if name in BLOCKED_ATTRIBUTES:
@@ -142,12 +153,6 @@ def guarded_getattr(obj, name):
             f"Access to '{name}' is not allowed for security reasons"
         )
 
-    # Block DataFrame I/O operations
-    if isinstance(obj, (pd.DataFrame, pd.Series)) and name in BLOCKED_DF_METHODS:
-        raise AttributeError(
-            f"DataFrame.{name}() is not allowed - data output is handled by the system"
-        )
-
     # Use default guarded getattr for additional checks
     return default_guarded_getattr(obj, name)
 
@@ -1,10 +1,18 @@
 """RestrictedPython compiler for safe code execution."""
 
 import ast
-from typing import Optional, Tuple
+import datetime
+import hashlib
+import math
+import re
+import textwrap
+from collections import OrderedDict
+from typing import List, Optional, Tuple
 
-from RestrictedPython import compile_restricted
+import numpy as np
+import pandas as pd
 from RestrictedPython.Eval import default_guarded_getitem
+from RestrictedPython.transformer import RestrictingNodeTransformer
 
 from sandbox.guards import (
     guarded_getattr,
@@ -16,6 +24,213 @@ from sandbox.guards import (
 from sandbox.safe_builtins import SAFE_BUILTINS
 
 
+# Modules user code may import
+ALLOWED_MODULES = frozenset({"pandas", "numpy", "datetime", "math"})
+
+# Builtins that must never be called directly
+DANGEROUS_CALLS = frozenset({"exec", "eval", "compile", "open", "__import__"})
+
+# Modules that may never be imported, with a more specific message than
+# the ALLOWED_MODULES check
+_BLOCKED_IMPORTS = frozenset({
+    "os",
+    "sys",
+    "subprocess",
+    "socket",
+    "ctypes",
+    "multiprocessing",
+    "threading",
+    "asyncio",
+    "concurrent",
+    "signal",
+    "shutil",
+    "tempfile",
+    "glob",
+    "fnmatch",
+    "pathlib",
+    "io",
+    "builtins",
+    "__builtins__",
+    "importlib",
+    "pkgutil",
+    "code",
+    "codeop",
+    "compile",
+    "dis",
+    "inspect",
+    "gc",
+    "weakref",
+    "pickle",
+    "shelve",
+    "marshal",
+    "dbm",
+    "sqlite3",
+    "ssl",
+    "http",
+    "urllib",
+    "ftplib",
+    "smtplib",
+    "email",
+    "xml",
+    "html",
+    "webbrowser",
+    "cmd",
+    "pdb",
+    "profile",
+    "timeit",
+    "trace",
+    "platform",
+    "getpass",
+    "pty",
+    "tty",
+    "termios",
+    "fcntl",
+    "select",
+    "mmap",
+    "resource",
+    "sysconfig",
+    "warnings",
+    "logging",
+})
+
+# Builtins shared by every run. The import statement looks __import__ up
+# here, never in globals. This stays a plain dict: CPython's import path
+# requires one and raises SystemError for a MappingProxyType.
+_SANDBOX_BUILTINS = {**SAFE_BUILTINS, "__import__": guarded_import}
+
+# Globals for restricted execution; get_restricted_globals() hands out copies
+_RESTRICTED_GLOBALS_TEMPLATE = {
+    "__builtins__": _SANDBOX_BUILTINS,
+    "_getattr_": guarded_getattr,
+    "_getitem_": default_guarded_getitem,
+    "_getiter_": iter,
+    "_iter_unpack_sequence_": guarded_iter_unpack_sequence,
+    "_unpack_sequence_": guarded_unpack_sequence,
+    "_write_": guarded_write,
+    # Provide allowed modules directly
+    "pd": pd,
+    "pandas": pd,
+    "np": np,
+    "numpy": np,
+    "datetime": datetime,
+    "math": math,
+}
+
+# Source substrings rejected outright (case-insensitive), with messages
+DANGEROUS_PATTERNS = (
+    ("__import__", "Dynamic imports are not allowed"),
+    ("importlib", "importlib is not allowed"),
+    ("exec(", "exec() is not allowed"),
+    ("eval(", "eval() is not allowed"),
+    ("compile(", "compile() is not allowed"),
+    ("open(", "File operations are not allowed"),
+    ("globals(", "globals() is not allowed"),
+    ("locals(", "locals() is not allowed"),
+    ("vars(", "vars() is not allowed"),
+    ("getattr(", "getattr() is not allowed - use direct attribute access"),
+    ("setattr(", "setattr() is not allowed"),
+    ("delattr(", "delattr() is not allowed"),
+    ("__builtins__", "Access to __builtins__ is not allowed"),
+    (".__class__", "Access to __class__ is not allowed"),
+    (".__bases__", "Access to __bases__ is not allowed"),
+    (".__subclasses__", "Access to __subclasses__ is not allowed"),
+    (".__globals__", "Access to __globals__ is not allowed"),
+    (".__code__", "Access to __code__ is not allowed"),
+)
+
+# All patterns as one alternation, so the source is scanned once
+_DANGEROUS_RE = re.compile(
+    "|".join(re.escape(pattern) for pattern, _ in DANGEROUS_PATTERNS),
+    re.IGNORECASE,
+)
+_DANGEROUS_MESSAGES = {
+    pattern.lower(): message for pattern, message in DANGEROUS_PATTERNS
+}
+# Source containing none of these characters cannot match any pattern
+_DANGER_FIRST_CHARS = frozenset(
+    char
+    for pattern, _ in DANGEROUS_PATTERNS
+    for char in (pattern[0].lower(), pattern[0].upper())
+)
+
+
+# Compile results keyed by a digest of the source, in LRU order
+_COMPILE_CACHE: "OrderedDict[bytes, Tuple[Optional[object], Optional[str]]]" = (
+    OrderedDict()
+)
+_COMPILE_CACHE_MAX = 512
+
+
+class _Reject(Exception):
+    """Raised by _Validator to stop the walk at the first violation."""
+
+
+class _Validator(ast.NodeVisitor):
+    """
+    AST visitor that rejects blocked constructs.
+
+    Nodes are dispatched with one dict lookup on their exact type instead
+    of NodeVisitor's per-node method name lookup, and the walk stops at
+    the first violation by raising _Reject.
+    """
+
+    def __init__(self, blocked_imports):
+        self.blocked_imports = blocked_imports
+
+    def _reject_async(self, node):
+        raise _Reject("Async constructs are not allowed")
+
+    def visit_Await(self, node):
+        raise _Reject("Await expressions are not allowed")
+
+    def visit_Import(self, node):
+        blocked = self.blocked_imports
+        for alias in node.names:
+            module = alias.name.split(".")[0]
+            if module in blocked:
+                raise _Reject(f"Import of '{alias.name}' is not allowed")
+            if module not in ALLOWED_MODULES:
+                raise _Reject(
+                    f"Import of '{alias.name}' is not allowed. Only pandas, numpy, datetime, and math are permitted."
+                )
+
+    def visit_ImportFrom(self, node):
+        if node.module:
+            module = node.module.split(".")[0]
+            if module in self.blocked_imports:
+                raise _Reject(f"Import from '{node.module}' is not allowed")
+            if module not in ALLOWED_MODULES:
+                raise _Reject(
+                    f"Import from '{node.module}' is not allowed. Only pandas, numpy, datetime, and math are permitted."
+                )
+
+    def visit_Call(self, node):
+        if isinstance(node.func, ast.Name) and node.func.id in DANGEROUS_CALLS:
+            raise _Reject(f"{node.func.id}() is not allowed")
+        self.generic_visit(node)
+
+    def _leaf(self, node):
+        """Leaves cannot contain blocked constructs; skip their children."""
+
+    _HANDLERS = {
+        ast.AsyncFunctionDef: _reject_async,
+        ast.AsyncFor: _reject_async,
+        ast.AsyncWith: _reject_async,
+        ast.Await: visit_Await,
+        ast.Import: visit_Import,
+        ast.ImportFrom: visit_ImportFrom,
+        ast.Call: visit_Call,
+        ast.Constant: _leaf,
+        ast.Name: _leaf,
+    }
+
+    def visit(self, node):
+        handler = self._HANDLERS.get(type(node))
+        if handler is None:
+            return self.generic_visit(node)
+        return handler(self, node)
+
+
 class RestrictedCompiler:
     """
     Compiles user code with RestrictedPython safety measures.
@@ -27,175 +242,91 @@ class RestrictedCompiler:
     """
 
     # Dangerous import patterns to block
-    BLOCKED_IMPORTS = {
-        "os",
-        "sys",
-        "subprocess",
-        "socket",
-        "ctypes",
-        "multiprocessing",
-        "threading",
-        "asyncio",
-        "concurrent",
-        "signal",
-        "shutil",
-        "tempfile",
-        "glob",
-        "fnmatch",
-        "pathlib",
-        "io",
-        "builtins",
-        "__builtins__",
-        "importlib",
-        "pkgutil",
-        "code",
-        "codeop",
-        "compile",
-        "dis",
-        "inspect",
-        "gc",
-        "weakref",
-        "pickle",
-        "shelve",
-        "marshal",
-        "dbm",
-        "sqlite3",
-        "ssl",
-        "http",
-        "urllib",
-        "ftplib",
-        "smtplib",
-        "email",
-        "xml",
-        "html",
-        "webbrowser",
-        "cmd",
-        "pdb",
-        "profile",
-        "timeit",
-        "trace",
-        "platform",
-        "getpass",
-        "pty",
-        "tty",
-        "termios",
-        "fcntl",
-        "select",
-        "mmap",
-        "resource",
-        "sysconfig",
-        "warnings",
-        "logging",
-    }
+    BLOCKED_IMPORTS = _BLOCKED_IMPORTS
 
     def compile_code(self, code: str) -> Tuple[Optional[object], Optional[str]]:
         """
         Compile user code with RestrictedPython.
 
+        Results, including errors, are cached by a digest of the source,
+        so repeated runs of a saved script skip validation and compilation.
+
         Returns:
             Tuple of (compiled_code, error_message)
             If successful: (code_object, None)
             If failed: (None, error_string)
         """
-        # Step 1: Pre-validation
-        error = self._pre_validate(code)
-        if error:
-            return None, error
+        key = hashlib.blake2b(code.encode("utf-8"), digest_size=16).digest()
+        cached = _COMPILE_CACHE.get(key)
+        if cached is not None:
+            _COMPILE_CACHE.move_to_end(key)
+            return cached
 
-        # Step 2: Wrap code to ensure transform function exists
+        result = self._compile_uncached(code)
+        _COMPILE_CACHE[key] = result
+        if len(_COMPILE_CACHE) > _COMPILE_CACHE_MAX:
+            _COMPILE_CACHE.popitem(last=False)
+        return result
+
+    def _compile_uncached(
+        self, code: str
+    ) -> Tuple[Optional[object], Optional[str]]:
+        """Validate, wrap and compile user code without consulting the cache."""
+        # Step 1: Wrap code to ensure transform function exists
         wrapped_code = self._wrap_transform_function(code)
 
-        # Step 3: Compile with RestrictedPython
+        # Step 2: Parse once; the same tree is validated and then compiled
         try:
-            result = compile_restricted(
-                wrapped_code,
-                filename="<user_script>",
-                mode="exec",
-            )
+            tree = ast.parse(wrapped_code, filename="<user_script>")
+        except SyntaxError as e:
+            tree = None
+            syntax_error = f"Syntax error: {e.msg}"
+
+        # Step 3: Pre-validation
+        error = self._pre_validate(code, tree)
+        if error:
+            return None, error
+        if tree is None:
+            return None, syntax_error
 
-            # Check for compilation errors
-            if result.errors:
-                return None, "\n".join(result.errors)
+        # Step 4: Apply RestrictedPython's policy to the parsed tree
+        try:
+            errors: List[str] = []
+            RestrictingNodeTransformer(errors, [], {}).visit(tree)
+            if errors:
+                return None, "\n".join(errors)
 
-            return result.code, None
+            ast.fix_missing_locations(tree)
+            return compile(tree, "<user_script>", "exec"), None
 
         except SyntaxError as e:
             return None, f"Syntax error at line {e.lineno}: {e.msg}"
         except Exception as e:
             return None, f"Compilation error: {str(e)}"
 
-    def _pre_validate(self, code: str) -> Optional[str]:
+    def _pre_validate(self, code: str, tree: Optional[ast.AST]) -> Optional[str]:
         """
         Pre-validation checks before compilation.
 
         Checks for dangerous patterns that should be blocked
-        before even attempting to compile.
+        before even attempting to compile. ``tree`` is the already parsed
+        module, or None if the code does not parse.
         """
-        # Check for dangerous string patterns
-        dangerous_patterns = [
-            ("__import__", "Dynamic imports are not allowed"),
-            ("importlib", "importlib is not allowed"),
-            ("exec(", "exec() is not allowed"),
-            ("eval(", "eval() is not allowed"),
-            ("compile(", "compile() is not allowed"),
-            ("open(", "File operations are not allowed"),
-            ("globals(", "globals() is not allowed"),
-            ("locals(", "locals() is not allowed"),
-            ("vars(", "vars() is not allowed"),
-            ("getattr(", "getattr() is not allowed - use direct attribute access"),
-            ("setattr(", "setattr() is not allowed"),
-            ("delattr(", "delattr() is not allowed"),
-            ("__builtins__", "Access to __builtins__ is not allowed"),
-            (".__class__", "Access to __class__ is not allowed"),
-            (".__bases__", "Access to __bases__ is not allowed"),
-            (".__subclasses__", "Access to __subclasses__ is not allowed"),
-            (".__globals__", "Access to __globals__ is not allowed"),
-            (".__code__", "Access to __code__ is not allowed"),
-        ]
-
-        code_lower = code.lower()
-        for pattern, message in dangerous_patterns:
-            if pattern.lower() in code_lower:
-                return message
-
-        # Parse AST to check for blocked constructs
-        try:
-            tree = ast.parse(code)
-        except SyntaxError as e:
-            return f"Syntax error: {e.msg}"
+        # Check for dangerous string patterns in a single pass, skipping
+        # the regex when no pattern could even start in this source
+        if not _DANGER_FIRST_CHARS.isdisjoint(code):
+            match = _DANGEROUS_RE.search(code)
+            if match:
+                return _DANGEROUS_MESSAGES[match.group(0).lower()]
+
+        if tree is None:
+            return None
 
         # Walk AST to check for dangerous constructs
-        for node in ast.walk(tree):
-            # Block async constructs
-            if isinstance(node, (ast.AsyncFunctionDef, ast.AsyncFor, ast.AsyncWith)):
-                return "Async constructs are not allowed"
-
-            # Block await expressions
-            if isinstance(node, ast.Await):
-                return "Await expressions are not allowed"
-
-            # Check imports
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    module = alias.name.split(".")[0]
-                    if module in self.BLOCKED_IMPORTS:
-                        return f"Import of '{alias.name}' is not allowed"
-                    if module not in {"pandas", "numpy", "datetime", "math"}:
-                        return f"Import of '{alias.name}' is not allowed. Only pandas, numpy, datetime, and math are permitted."
-
-            if isinstance(node, ast.ImportFrom):
-                if node.module:
-                    module = node.module.split(".")[0]
-                    if module in self.BLOCKED_IMPORTS:
-                        return f"Import from '{node.module}' is not allowed"
-                    if module not in {"pandas", "numpy", "datetime", "math"}:
-                        return f"Import from '{node.module}' is not allowed. Only pandas, numpy, datetime, and math are permitted."
-
-            # Block dangerous function calls
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name):
-                    if node.func.id in {"exec", "eval", "compile", "open", "__import__"}:
-                        return f"{node.func.id}() is not allowed"
+        try:
+            _Validator(self.BLOCKED_IMPORTS).visit(tree)
+        except _Reject as e:
+            return str(e)
 
         return None
 
@@ -210,15 +341,10 @@ class RestrictedCompiler:
             return code
 
         # Wrap code in transform function
-        # Indent all lines by 4 spaces
-        indented_code = "\n".join(
-            f"    {line}" if line.strip() else line
-            for line in code.split("\n")
-        )
-
+        # Indent all non-blank lines by 4 spaces
         return f"""
 def transform(df):
-{indented_code}
+{textwrap.indent(code, "    ")}
     return df
 """
 
@@ -227,21 +353,7 @@ def transform(df):
         Get the restricted globals dictionary for execution.
 
         This sets up the security guards that will be used at runtime.
+        Each call returns a fresh shallow copy of a prebuilt template, so
+        user code cannot leak names into later runs.
         """
-        return {
-            "__builtins__": SAFE_BUILTINS,
-            "_getattr_": guarded_getattr,
-            "_getitem_": default_guarded_getitem,
-            "_getiter_": iter,
-            "_iter_unpack_sequence_": guarded_iter_unpack_sequence,
-            "_unpack_sequence_": guarded_unpack_sequence,
-            "_write_": guarded_write,
-            "__import__": guarded_import,
-            # Provide allowed modules directly
-            "pd": __import__("pandas"),
-            "pandas": __import__("pandas"),
-            "np": __import__("numpy"),
-            "numpy": __import__("numpy"),
-            "datetime": __import__("datetime"),
-            "math": __import__("math"),
-        }
+        return _RESTRICTED_GLOBALS_TEMPLATE.copy()
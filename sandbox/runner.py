@@ -2,8 +2,11 @@
 """
 Sandbox runner script - executed as an isolated subprocess.
 
-This script receives code and DataFrame via stdin (pickled),
-executes the transform function, and returns the result via stdout.
+This script is started ahead of time and imports its dependencies before
+blocking on stdin. It then receives compiled code and its sandbox directory
+via stdin and the input DataFrame through a file in that directory,
+executes the transform function, and writes the pickled result to another
+file next to it. Each runner process handles a single job.
 
 SECURITY: This script runs in a subprocess with:
 - Isolated working directory
@@ -11,21 +14,54 @@ SECURITY: This script runs in a subprocess with:
 - CREATE_NO_WINDOW flag on Windows
 """
 
+import marshal
+import os
 import pickle
+import re
+import struct
 import sys
 import traceback
 
+# Imported before waiting for a job, so a pre-started runner is warm
+import numpy  # noqa: F401
+import pandas as pd
+
+from sandbox.restricted_compiler import RestrictedCompiler
+
+# Data files, relative to the sandbox working directory
+INPUT_FRAME_FILE = "input_frame.pkl"
+RESULT_FILE = "result.pkl"
+STDERR_FILE = "stderr.log"
+
+# Data file layout: header (pickle length, buffer count), the protocol 5
+# pickle stream, then each out-of-band buffer prefixed with its length
+_HEADER = struct.Struct("<QI")
+_BUFFER_LEN = struct.Struct("<Q")
+
+# Files whose frames are hidden from users
+_INTERNAL_FILE_RE = re.compile(r"RestrictedPython|sandbox[/\\]runner\.py")
+
 
 def main():
     """Main entry point for sandbox subprocess."""
     try:
         # Read pickled input from stdin
         input_bytes = sys.stdin.buffer.read()
+        if not input_bytes:
+            # The parent shut down before handing this runner a job
+            return
         input_data = pickle.loads(input_bytes)
 
-        code = input_data["code"]
-        df = input_data["dataframe"]
-        restricted_globals = input_data["globals"]
+        _enter_workdir(input_data["workdir"])
+
+        code = marshal.loads(input_data["code"])
+
+        # Build the restricted globals here: they are the same for every job,
+        # and module references cannot be pickled across anyway
+        restricted_globals = RestrictedCompiler().get_restricted_globals()
+
+        # Load the DataFrame the parent left in our working directory
+        df = read_data_file(input_data["dataframe_file"])
 
         # Create local scope with DataFrame
         local_scope = {"df": df}
@@ -46,8 +82,6 @@ def main():
         result_df = transform_func(df)
 
         # Validate result is a DataFrame
-        import pandas as pd
-
         if not isinstance(result_df, pd.DataFrame):
             raise TypeError(
                 f"transform() must return a DataFrame, got {type(result_df).__name__}"
@@ -66,11 +100,8 @@ def main():
         }
 
     except Exception as e:
-        # Capture full traceback for debugging
-        tb = traceback.format_exc()
-
-        # Filter traceback to remove internal frames
-        filtered_tb = _filter_traceback(tb)
+        # Capture the traceback for debugging, minus internal frames
+        filtered_tb = _filter_traceback(e)
 
         response = {
             "success": False,
@@ -79,41 +110,87 @@ def main():
             "traceback": filtered_tb,
         }
 
-    # Write pickled response to stdout
+    # Write the response to the result file. A file never blocks the
+    # way a full stdout pipe would while the parent waits for us to exit.
     try:
-        output_bytes = pickle.dumps(response)
-        sys.stdout.buffer.write(output_bytes)
-        sys.stdout.buffer.flush()
+        write_data_file(RESULT_FILE, response)
     except Exception as e:
         # Last resort error handling
         sys.stderr.write(f"Failed to serialize response: {e}\n")
         sys.exit(1)
 
 
-def _filter_traceback(tb: str) -> str:
-    """
-    Filter traceback to show only user code frames.
+def _enter_workdir(workdir: str):
+    """Move into the job's sandbox directory and send stderr to a file there."""
+    os.chdir(workdir)
+    fd = os.open(STDERR_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.dup2(fd, sys.stderr.fileno())
+    os.close(fd)
 
-    Removes internal RestrictedPython frames for cleaner output.
+
+def write_data_file(path, obj) -> int:
     """
-    lines = tb.split("\n")
-    filtered_lines = []
-    skip_until_user = False
+    Pickle an object to a data file with protocol 5.
 
-    for line in lines:
-        # Skip RestrictedPython internal frames
-        if "RestrictedPython" in line or "sandbox/runner.py" in line:
-            skip_until_user = True
-            continue
+    Large contiguous buffers, such as numpy column data, are written out of
+    band as raw bytes instead of being copied into the pickle stream.
 
-        # Show user script frames
-        if "<user_script>" in line:
-            skip_until_user = False
+    Returns:
+        Number of bytes written
+    """
+    buffers = []
+    data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    size = _HEADER.size + len(data)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(len(data), len(buffers)))
+        f.write(data)
+        for buffer in buffers:
+            raw = buffer.raw()
+            f.write(_BUFFER_LEN.pack(raw.nbytes))
+            f.write(raw)
+            size += _BUFFER_LEN.size + raw.nbytes
+    return size
+
+
+def read_data_file(path):
+    """
+    Load an object written by write_data_file.
 
-        if not skip_until_user:
-            filtered_lines.append(line)
+    Out-of-band buffers are read straight into writable bytearrays that
+    the unpickled arrays then use without another copy.
+    """
+    with open(path, "rb") as f:
+        data_len, buffer_count = _HEADER.unpack(f.read(_HEADER.size))
+        data = f.read(data_len)
+        buffers = []
+        for _ in range(buffer_count):
+            (nbytes,) = _BUFFER_LEN.unpack(f.read(_BUFFER_LEN.size))
+            buffer = bytearray(nbytes)
+            f.readinto(buffer)
+            buffers.append(buffer)
+    return pickle.loads(data, buffers=buffers)
+
+
+def _filter_traceback(exc: BaseException) -> str:
+    """
+    Format an exception's traceback showing only user code frames.
 
-    return "\n".join(filtered_lines)
+    Internal RestrictedPython and runner frames are dropped from the
+    structured frame summaries before anything is formatted.
+    """
+    te = traceback.TracebackException.from_exception(exc)
+    current = te
+    # Chained exceptions carry their own stacks
+    while current is not None:
+        current.stack = traceback.StackSummary.from_list(
+            [
+                frame
+                for frame in current.stack
+                if not _INTERNAL_FILE_RE.search(frame.filename)
+            ]
+        )
+        current = current.__cause__ or current.__context__
+    return "".join(te.format())
 
 
 if __name__ == "__main__":
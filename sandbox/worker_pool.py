@@ -0,0 +1,79 @@
+"""
+Pool of pre-started sandbox runner processes.
+
+Starting an interpreter and importing pandas/numpy dominates small jobs.
+The pool keeps runners that have already paid that cost waiting on stdin.
+Each runner still executes exactly one job and exits, so no interpreter
+state is ever shared between jobs.
+"""
+
+import atexit
+import os
+import subprocess
+import threading
+from typing import Callable, List, Optional
+
+
+class WarmRunnerPool:
+    """Keeps a fixed number of idle runner processes ready to take a job."""
+
+    def __init__(self, spawn: Callable[[], subprocess.Popen], size: int):
+        """
+        Args:
+            spawn: Starts one runner process with stdin as a pipe
+            size: Number of idle runners to keep; 0 spawns on demand only
+        """
+        self._spawn = spawn
+        self.size = size
+        self._idle: List[subprocess.Popen] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> subprocess.Popen:
+        """Take an idle runner, or start one if none is ready."""
+        with self._lock:
+            while self._idle:
+                process = self._idle.pop()
+                if process.poll() is None:
+                    return process
+        return self._spawn()
+
+    def refill(self):
+        """
+        Top the pool back up to its size.
+
+        Called once a job has finished rather than from acquire(), so the
+        replacement's imports do not compete with the job for CPU.
+        """
+        with self._lock:
+            while len(self._idle) < self.size:
+                self._idle.append(self._spawn())
+
+    def shutdown(self):
+        """Kill all idle runners."""
+        with self._lock:
+            for process in self._idle:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+            self._idle.clear()
+
+
+_pool: Optional[WarmRunnerPool] = None
+_pool_pid: Optional[int] = None
+
+
+def get_runner_pool(
+    spawn: Callable[[], subprocess.Popen], size: int
+) -> WarmRunnerPool:
+    """
+    Return this process's runner pool, creating it on first use.
+
+    Keyed on the PID so a forked worker never reuses runners whose pipes
+    belong to its parent.
+    """
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        _pool = WarmRunnerPool(spawn, size)
+        _pool_pid = os.getpid()
+        atexit.register(_pool.shutdown)
+    return _pool
@@ -11,6 +11,7 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import numpy as np
 import pandas as pd
 from sqlalchemy import text
 
@@ -19,6 +20,11 @@ from app.core.security import hash_password
 from app.database import AsyncSessionLocal, engine, sync_engine
 from app.models import Base, User, Script
 from app.models.user import UserRole
+from worker.data_handler import copy_insert
+
+# Sample table sizes
+SALES_ROWS = 100
+CUSTOMER_ROWS = 50
 
 
 async def create_tables():
@@ -88,29 +94,40 @@ def create_sample_tables():
     """Create sample data tables for testing."""
     settings = get_settings()
 
-    # Sample sales data
+    # Sample sales data, built with vectorized column operations so the
+    # row counts can be raised for load testing
+    sales_ids = np.arange(1, SALES_ROWS + 1)
     sales_data = pd.DataFrame({
-        "id": range(1, 101),
-        "product": [f"Product_{i % 10}" for i in range(1, 101)],
-        "price": [round(10 + (i * 0.5), 2) for i in range(1, 101)],
-        "qty": [(i % 20) + 1 for i in range(1, 101)],
-        "region": ["North", "South", "East", "West"] * 25,
+        "id": sales_ids,
+        "product": "Product_" + pd.Series(sales_ids % 10).astype(str),
+        "price": np.round(10 + sales_ids * 0.5, 2),
+        "qty": (sales_ids % 20) + 1,
+        "region": np.resize(["North", "South", "East", "West"], SALES_ROWS),
     })
 
     # Sample customers data
+    customer_ids = pd.Series(np.arange(1, CUSTOMER_ROWS + 1))
+    customer_suffix = customer_ids.astype(str)
     customers_data = pd.DataFrame({
-        "id": range(1, 51),
-        "name": [f"Customer_{i}" for i in range(1, 51)],
-        "email": [f"customer{i}@example.com" for i in range(1, 51)],
-        "city": ["New York", "Los Angeles", "Chicago", "Houston", "Phoenix"] * 10,
-        "signup_date": pd.date_range("2024-01-01", periods=50, freq="D"),
+        "id": customer_ids,
+        "name": "Customer_" + customer_suffix,
+        "email": "customer" + customer_suffix + "@example.com",
+        "city": np.resize(
+            ["New York", "Los Angeles", "Chicago", "Houston", "Phoenix"],
+            CUSTOMER_ROWS,
+        ),
+        "signup_date": pd.date_range("2024-01-01", periods=CUSTOMER_ROWS, freq="D"),
     })
 
     # Write to database
-    sales_data.to_sql("sales", sync_engine, if_exists="replace", index=False)
+    sales_data.to_sql(
+        "sales", sync_engine, if_exists="replace", index=False, method=copy_insert
+    )
     print(f"Created 'sales' table with {len(sales_data)} rows")
 
-    customers_data.to_sql("customers", sync_engine, if_exists="replace", index=False)
+    customers_data.to_sql(
+        "customers", sync_engine, if_exists="replace", index=False, method=copy_insert
+    )
     print(f"Created 'customers' table with {len(customers_data)} rows")
 
 
@@ -0,0 +1,83 @@
+"""Tests for password hashing and JWT helpers."""
+
+from datetime import timedelta
+
+import bcrypt
+import pytest
+
+from app.core.security import (
+    create_access_token,
+    decode_token,
+    hash_password,
+    hash_password_async,
+    verify_and_update_password,
+    verify_password,
+    verify_password_async,
+)
+
+
+class TestPasswordHashing:
+    """Test password hashing."""
+
+    def test_hash_uses_argon2(self):
+        """New hashes should use argon2id."""
+        hashed = hash_password("testpassword")
+        assert hashed.startswith("$argon2id$")
+        assert verify_password("testpassword", hashed) is True
+        assert verify_password("wrongpassword", hashed) is False
+
+    def test_bcrypt_hash_is_upgraded(self):
+        """Legacy bcrypt hashes should verify and yield an argon2 replacement."""
+        legacy = bcrypt.hashpw(b"testpassword", bcrypt.gensalt(rounds=4)).decode("ascii")
+
+        valid, new_hash = verify_and_update_password("testpassword", legacy)
+
+        assert valid is True
+        assert new_hash.startswith("$argon2id$")
+        assert verify_password("testpassword", new_hash) is True
+
+    def test_wrong_password_not_upgraded(self):
+        """Failed verification should not produce a replacement hash."""
+        legacy = bcrypt.hashpw(b"testpassword", bcrypt.gensalt(rounds=4)).decode("ascii")
+        assert verify_and_update_password("wrongpassword", legacy) == (False, None)
+
+    def test_malformed_hash_rejected(self):
+        """Unparseable stored hashes should fail verification, not raise."""
+        assert verify_password("testpassword", "not-a-hash") is False
+
+    def test_overlong_password_rejected(self):
+        """Passwords over the byte limit should fail verification."""
+        hashed = hash_password("testpassword")
+        assert verify_password("x" * 100, hashed) is False
+
+    @pytest.mark.asyncio
+    async def test_async_helpers(self):
+        """Async wrappers should match the sync behavior."""
+        hashed = await hash_password_async("testpassword")
+        assert await verify_password_async("testpassword", hashed) is True
+        assert await verify_password_async("wrongpassword", hashed) is False
+
+
+class TestTokens:
+    """Test JWT creation and decoding."""
+
+    def test_round_trip(self):
+        """A freshly issued token should decode to its claims."""
+        token = create_access_token({"sub": "42"})
+        payload = decode_token(token)
+        assert payload["sub"] == "42"
+
+    def test_invalid_token_rejected(self):
+        """Garbage tokens should decode to None."""
+        assert decode_token("not-a-token") is None
+
+    def test_expired_token_rejected(self):
+        """Expired tokens should be rejected even if previously cached."""
+        token = create_access_token({"sub": "42"}, expires_delta=timedelta(seconds=-1))
+        assert decode_token(token) is None
+
+    def test_decoded_payload_is_a_copy(self):
+        """Mutating a decoded payload should not affect later decodes."""
+        token = create_access_token({"sub": "42"})
+        decode_token(token)["sub"] = "tampered"
+        assert decode_token(token)["sub"] == "42"
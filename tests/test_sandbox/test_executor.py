@@ -1,8 +1,11 @@
 """Tests for sandbox executor."""
 
+import os
+
 import pytest
 import pandas as pd
 
+from sandbox import executor as executor_module
 from sandbox.executor import SandboxExecutor
 
 
@@ -111,6 +114,35 @@ def transform(df):
         assert success is False
         assert "DataFrame" in logs
 
+    def test_prepared_code_runs_on_each_chunk(self):
+        """Code prepared once should run on several DataFrames."""
+        executor = SandboxExecutor(job_id=7)
+        prepared, error = executor.prepare("""
+def transform(df):
+    df["b"] = df["a"] * 2
+    return df
+""")
+        assert error is None
+
+        for values in ([1, 2], [3]):
+            success, result, logs = executor.run(prepared, pd.DataFrame({"a": values}))
+            assert success is True
+            assert list(result["b"]) == [v * 2 for v in values]
+
+    def test_prepare_reports_compile_error(self):
+        """Blocked code should fail in prepare without running."""
+        executor = SandboxExecutor(job_id=8)
+        prepared, error = executor.prepare("import os")
+
+        assert prepared is None
+        assert error is not None
+
+    def test_slots_use_separate_sandbox_dirs(self):
+        """Executors running one job's chunks side by side must not share a dir."""
+        dirs = {SandboxExecutor(job_id=9, slot=slot).sandbox_dir for slot in range(3)}
+
+        assert len(dirs) == 3
+
 
 class TestSandboxSecurity:
     """Test sandbox security measures."""
@@ -159,3 +191,23 @@ def transform(df):
         success, result, logs = executor.execute(code, df)
 
         assert success is False
+
+
+@pytest.mark.skipif(os.name == "nt", reason="kernel rlimits are POSIX only")
+class TestRunnerLimits:
+    """Test kernel limits on spawned runners."""
+
+    def test_runner_spawned_with_memory_limit(self):
+        """A fresh runner should already carry the memory limit."""
+        resource = pytest.importorskip("resource")
+        if not hasattr(resource, "prlimit"):
+            pytest.skip("prlimit() not available")
+
+        process = executor_module._spawn_runner()
+        try:
+            expected = executor_module.SANDBOX_MAX_MEMORY * 1024 * 1024
+            limits = resource.prlimit(process.pid, resource.RLIMIT_DATA)
+            assert limits == (expected, expected)
+        finally:
+            process.kill()
+            process.wait()
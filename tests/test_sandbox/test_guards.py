@@ -0,0 +1,47 @@
+"""Tests for runtime sandbox guards."""
+
+import pandas as pd
+import pytest
+
+from sandbox.guards import guarded_getattr
+
+
+class TestGuardedGetattr:
+    """Test attribute access guard."""
+
+    @pytest.fixture
+    def df(self):
+        return pd.DataFrame({"a": [1, 2]})
+
+    def test_public_attribute_allowed(self, df):
+        """Ordinary DataFrame attributes should be returned."""
+        assert guarded_getattr(df, "shape") == (2, 1)
+
+    def test_safe_dunder_allowed(self, df):
+        """Dunders on the allowlist should be returned."""
+        assert guarded_getattr(df, "__len__")() == 2
+
+    @pytest.mark.parametrize(
+        "name",
+        ["__class__", "__dict__", "__reduce_ex__", "__init__", "_mgr"],
+    )
+    def test_private_and_blocked_attributes_rejected(self, df, name):
+        """Private and non-allowlisted dunder attributes should raise."""
+        with pytest.raises(AttributeError):
+            guarded_getattr(df, name)
+
+    @pytest.mark.parametrize("name", ["to_csv", "to_pickle", "to_sql"])
+    def test_pandas_io_methods_rejected(self, df, name):
+        """DataFrame and Series I/O methods should raise."""
+        with pytest.raises(AttributeError):
+            guarded_getattr(df, name)
+        with pytest.raises(AttributeError):
+            guarded_getattr(df["a"], name)
+
+    def test_io_method_names_allowed_on_other_objects(self):
+        """I/O method names are only blocked on pandas objects."""
+
+        class Exporter:
+            to_csv = "ok"
+
+        assert guarded_getattr(Exporter(), "to_csv") == "ok"
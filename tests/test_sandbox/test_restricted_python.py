@@ -101,6 +101,8 @@ class TestBlockedBuiltins:
         "__import__('os')",
         "globals()",
         "locals()",
+        "EVAL('1+1')",
+        "Vars()",
     ])
     def test_dangerous_builtins_blocked(self, compiler, builtin_call):
         """Dangerous builtins should be blocked."""
@@ -0,0 +1,54 @@
+"""Tests for the pre-started runner pool."""
+
+import subprocess
+import sys
+
+import pytest
+
+from sandbox.worker_pool import WarmRunnerPool
+
+
+def _spawn_idle():
+    """Start a stand-in runner that waits on stdin and exits."""
+    return subprocess.Popen(
+        [sys.executable, "-c", "import sys; sys.stdin.buffer.read()"],
+        stdin=subprocess.PIPE,
+    )
+
+
+class TestWarmRunnerPool:
+    """Test runner reuse and replacement."""
+
+    @pytest.fixture
+    def pool(self):
+        pool = WarmRunnerPool(_spawn_idle, size=1)
+        yield pool
+        pool.shutdown()
+
+    def test_acquire_returns_prestarted_runner(self, pool):
+        """A refilled pool should hand out the runner it started."""
+        pool.refill()
+        idle = list(pool._idle)
+
+        process = pool.acquire()
+        try:
+            assert process is idle[0]
+            assert pool._idle == []
+        finally:
+            process.kill()
+            process.wait()
+
+    def test_dead_runner_is_skipped(self, pool):
+        """Runners that exited while idle should be replaced, not reused."""
+        pool.refill()
+        dead = pool._idle[0]
+        dead.kill()
+        dead.wait()
+
+        process = pool.acquire()
+        try:
+            assert process is not dead
+            assert process.poll() is None
+        finally:
+            process.kill()
+            process.wait()
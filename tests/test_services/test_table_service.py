@@ -0,0 +1,85 @@
+"""Tests for table service helpers."""
+
+import pytest
+
+from app.schemas.table import ColumnInfo
+from app.services import table_service
+from app.services.table_service import TableService, invalidate_table_cache
+
+
+class TestTableNameValidation:
+    """Test table name validation."""
+
+    @pytest.mark.parametrize("name", [
+        "sales",
+        "Sales_2024",
+        "a",
+        "t" * 63,
+        "users_archive",
+        "my_jobs",
+    ])
+    def test_valid_names_accepted(self, name):
+        """Plain identifiers should be accepted."""
+        assert TableService.is_valid_table_name(name) is True
+
+    @pytest.mark.parametrize("name", [
+        "",
+        "1sales",
+        "_sales",
+        "sales-data",
+        'sales"; DROP TABLE users; --',
+        "t" * 64,
+        "users",
+        "JOBS",
+        "pg_class",
+        "sql_features",
+        "information_schema_tables",
+        "Information_Schema",
+        "sales\n",
+    ])
+    def test_invalid_names_rejected(self, name):
+        """Malformed, system, and reserved names should be rejected."""
+        assert TableService.is_valid_table_name(name) is False
+
+
+class TestSchemaCache:
+    """Test the in-process table schema cache."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        invalidate_table_cache()
+        yield
+        invalidate_table_cache()
+
+    @pytest.fixture
+    def columns(self):
+        return [ColumnInfo(name="id", type="integer", nullable=False)]
+
+    def test_stored_schema_returned(self, columns):
+        """A freshly stored schema should be served from the cache."""
+        table_service._store_schema("sales", columns)
+        assert table_service._cached_schema("sales") == columns
+
+    def test_expired_schema_dropped(self, columns, monkeypatch):
+        """Entries older than the TTL should be treated as missing."""
+        table_service._store_schema("sales", columns)
+        monkeypatch.setattr(
+            table_service.settings, "TABLE_CACHE_TTL_SECONDS", 0.0
+        )
+        assert table_service._cached_schema("sales") is None
+
+    def test_invalidate_single_table(self, columns):
+        """Invalidating one table should keep the others."""
+        table_service._store_schema("sales", columns)
+        table_service._store_schema("orders", columns)
+        invalidate_table_cache("sales")
+        assert table_service._cached_schema("sales") is None
+        assert table_service._cached_schema("orders") == columns
+
+    def test_oldest_entry_evicted_when_full(self, columns, monkeypatch):
+        """The cache should stay bounded."""
+        monkeypatch.setattr(table_service, "_SCHEMA_CACHE_MAX", 2)
+        for name in ("a", "b", "c"):
+            table_service._store_schema(name, columns)
+        assert table_service._cached_schema("a") is None
+        assert table_service._cached_schema("c") == columns
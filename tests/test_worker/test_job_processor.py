@@ -0,0 +1,260 @@
+"""Tests for job processor helpers."""
+
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from worker import job_processor
+from worker.job_processor import JobProcessor, LogBuffer, settings
+
+
+class TestLogBuffer:
+    """Test incremental job log building."""
+
+    def test_snapshot_matches_joined_entries(self):
+        """The full log should read like the entries joined by newlines."""
+        logs = LogBuffer()
+        entries = ["[00:00:00.000] Job started", "multi\nline", "done"]
+        for entry in entries:
+            logs.append(entry)
+
+        assert logs.snapshot() == "\n".join(entries)
+
+    def test_unsaved_returns_only_new_text(self):
+        """Progress pieces should concatenate to the full log."""
+        logs = LogBuffer()
+        logs.append("a")
+        logs.append("b")
+        assert logs.unsaved() == (0, "a\nb")
+
+        logs.append("c")
+        assert logs.unsaved() == (3, "\nc")
+        assert logs.unsaved() == (5, "")
+        assert logs.snapshot() == "a\nb\nc"
+
+    def test_empty_log(self):
+        """A fresh buffer should be empty."""
+        assert LogBuffer().snapshot() == ""
+
+
+class StubDataHandler:
+    """Data handler that serves numbered one-row chunks from memory."""
+
+    def __init__(self, chunks, fail_load_at=None, fail_write_at=None):
+        self.chunks = chunks
+        self.fail_load_at = fail_load_at
+        self.fail_write_at = fail_write_at
+        self.loaded = 0
+        self.writes = []
+        self.closed = False
+
+    def estimate_row_count(self, table_name):
+        return settings.CHUNK_SIZE + 1
+
+    def iter_table_chunks(self, table_name, chunk_size):
+        try:
+            for chunk in range(1, self.chunks + 1):
+                if chunk == self.fail_load_at:
+                    raise RuntimeError("load failed")
+                self.loaded += 1
+                yield pd.DataFrame({"chunk": [chunk]})
+        finally:
+            self.closed = True
+
+    def write_dataframe(self, df, table_name, if_exists):
+        chunk = int(df["chunk"].iloc[0])
+        if chunk == self.fail_write_at:
+            raise RuntimeError("write failed")
+        self.writes.append((chunk, if_exists))
+        return len(df)
+
+
+class StubQueueManager:
+    """Queue manager that records status updates instead of writing them."""
+
+    def __init__(self, cancel_at=None):
+        self.cancel_at = cancel_at
+        self.checks = 0
+        self.failed = []
+        self.completed = []
+
+    async def check_job_cancelled(self, job_id):
+        self.checks += 1
+        return self.checks == self.cancel_at
+
+    async def mark_job_failed(self, job_id, error_message, logs):
+        self.failed.append(error_message)
+
+    async def mark_job_completed(self, job_id, rows_processed, logs):
+        self.completed.append(rows_processed)
+
+    async def update_job_progress(self, job_id, rows_processed, new_logs, log_offset):
+        pass
+
+
+class StubExecutor:
+    """Sandbox executor whose per-chunk delay and outcome are scripted."""
+
+    delays = {}
+    fail_at = None
+    raise_at = None
+    # (chunk, executor, start, end) for every run, in completion order
+    runs = []
+
+    def __init__(self, job_id, slot=None):
+        self.cancelled = False
+
+    def prepare(self, code):
+        return b"prepared", None
+
+    def run(self, prepared, df):
+        chunk = int(df["chunk"].iloc[0])
+        start = time.monotonic()
+        time.sleep(self.delays.get(chunk, 0.0))
+        StubExecutor.runs.append((chunk, self, start, time.monotonic()))
+        if chunk == self.raise_at:
+            raise RuntimeError("runner crashed")
+        if chunk == self.fail_at:
+            return False, None, "failed"
+        return True, df, "ok"
+
+    def cancel(self):
+        self.cancelled = True
+
+
+@pytest.fixture
+def stub_executor(monkeypatch):
+    monkeypatch.setattr(job_processor, "SandboxExecutor", StubExecutor)
+    monkeypatch.setattr(StubExecutor, "delays", {})
+    monkeypatch.setattr(StubExecutor, "fail_at", None)
+    monkeypatch.setattr(StubExecutor, "raise_at", None)
+    monkeypatch.setattr(StubExecutor, "runs", [])
+    monkeypatch.setattr(settings, "SANDBOX_PARALLEL_CHUNKS", 1)
+    return StubExecutor
+
+
+def _processor(data_handler, queue_manager):
+    """Build a JobProcessor around stubs."""
+    processor = JobProcessor.__new__(JobProcessor)
+    processor.data_handler = data_handler
+    processor.queue_manager = queue_manager
+    return processor
+
+
+async def _process(processor, monkeypatch):
+    """Run process() with the job and script loads stubbed out."""
+
+    @asynccontextmanager
+    async def no_session():
+        yield None
+
+    async def load_job(db, job_id):
+        return SimpleNamespace(script_id=1, source_table="src", destination_table="dst")
+
+    async def load_script(db, script_id):
+        return SimpleNamespace(code_text="def transform(df): return df")
+
+    monkeypatch.setattr(job_processor, "AsyncSessionLocal", no_session)
+    monkeypatch.setattr(processor, "_load_job", load_job)
+    monkeypatch.setattr(processor, "_load_script", load_script)
+    return await processor.process(1)
+
+
+class TestChunkPipeline:
+    """Test the load/execute/write pipeline of chunked jobs."""
+
+    @pytest.mark.asyncio
+    async def test_chunks_written_in_source_order(self, stub_executor, monkeypatch):
+        """The first chunk replaces the table and the rest append in order."""
+        handler = StubDataHandler(chunks=4)
+        queue = StubQueueManager()
+
+        assert await _process(_processor(handler, queue), monkeypatch) is True
+
+        assert handler.writes == [
+            (1, "replace"), (2, "append"), (3, "append"), (4, "append")
+        ]
+        assert queue.completed == [4]
+        assert queue.failed == []
+        assert handler.closed is True
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("stage", ["load", "execute", "write"])
+    async def test_stage_failure_marks_job_failed_once(
+        self, stage, stub_executor, monkeypatch
+    ):
+        """A failing stage stops the others and fails the job exactly once."""
+        handler = StubDataHandler(
+            chunks=50,
+            fail_load_at=2 if stage == "load" else None,
+            fail_write_at=2 if stage == "write" else None,
+        )
+        if stage == "execute":
+            stub_executor.fail_at = 2
+        queue = StubQueueManager()
+
+        assert await _process(_processor(handler, queue), monkeypatch) is False
+
+        assert len(queue.failed) == 1
+        assert queue.completed == []
+        # Nothing from the failing chunk on is written
+        assert [chunk for chunk, _ in handler.writes] in ([], [1])
+        # The loader was stopped well before the end of the table
+        assert handler.loaded < 10
+        assert handler.closed is True
+
+    @pytest.mark.asyncio
+    async def test_cancellation_stops_before_next_write(self, stub_executor, monkeypatch):
+        """A job cancelled by the user writes no chunk after the check."""
+        handler = StubDataHandler(chunks=10)
+        queue = StubQueueManager(cancel_at=2)
+
+        assert await _process(_processor(handler, queue), monkeypatch) is False
+
+        # The second check stops the job before chunk 2 is written
+        assert [chunk for chunk, _ in handler.writes] in ([], [1])
+        assert queue.completed == []
+        assert queue.failed == []
+        assert handler.closed is True
+
+
+class TestParallelChunks:
+    """Test chunks executed side by side with SANDBOX_PARALLEL_CHUNKS."""
+
+    @pytest.mark.asyncio
+    async def test_out_of_order_results_written_in_order(
+        self, stub_executor, monkeypatch
+    ):
+        """Later chunks finishing first must still be written after earlier ones."""
+        monkeypatch.setattr(settings, "SANDBOX_PARALLEL_CHUNKS", 3)
+        stub_executor.delays = {1: 0.3, 2: 0.15}
+        handler = StubDataHandler(chunks=5)
+        queue = StubQueueManager()
+
+        assert await _process(_processor(handler, queue), monkeypatch) is True
+
+        finished = [chunk for chunk, _, _, _ in stub_executor.runs]
+        assert finished.index(3) < finished.index(2) < finished.index(1)
+        assert [chunk for chunk, _ in handler.writes] == [1, 2, 3, 4, 5]
+        assert handler.writes[0] == (1, "replace")
+
+    @pytest.mark.asyncio
+    async def test_executor_reused_after_exception(self, stub_executor, monkeypatch):
+        """An executor whose run raised goes back to the idle set."""
+        monkeypatch.setattr(settings, "SANDBOX_PARALLEL_CHUNKS", 2)
+        stub_executor.delays = {1: 0.3}
+        stub_executor.raise_at = 2
+        handler = StubDataHandler(chunks=3)
+        queue = StubQueueManager()
+
+        assert await _process(_processor(handler, queue), monkeypatch) is False
+
+        runs = {chunk: (executor, start, end) for chunk, executor, start, end in stub_executor.runs}
+        # Chunk 3 ran on chunk 2's executor while chunk 1 was still running
+        assert runs[3][0] is runs[2][0]
+        assert runs[3][1] < runs[1][2]
+        assert queue.failed == ["runner crashed"]
+        assert handler.closed is True
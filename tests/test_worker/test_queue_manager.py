@@ -0,0 +1,18 @@
+"""Tests for queue manager helpers."""
+
+import pytest
+
+from worker.queue_manager import _rows_affected
+
+
+class TestRowsAffected:
+    """Test command tag parsing."""
+
+    @pytest.mark.parametrize("tag,expected", [
+        ("UPDATE 1", 1),
+        ("UPDATE 0", 0),
+        ("INSERT 0 3", 3),
+    ])
+    def test_parses_trailing_count(self, tag, expected):
+        """The row count is the last field of the command tag."""
+        assert _rows_affected(tag) == expected
@@ -1,11 +1,18 @@
 """Data handler for reading/writing DataFrames to PostgreSQL."""
 
+import functools
+import io
 import logging
 import re
-from typing import Optional
+from typing import Iterable, Iterator, Optional, Tuple
 
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import Engine, create_engine, make_url, text
+
+try:
+    import connectorx as cx
+except ImportError:  # Optional, see requirements.txt
+    cx = None
 
 from app.config import get_settings
 
@@ -13,7 +20,82 @@ settings = get_settings()
 logger = logging.getLogger("worker")
 
 # System tables that cannot be used as destinations
-SYSTEM_TABLES = {"users", "scripts", "jobs", "alembic_version"}
+SYSTEM_TABLES = frozenset({"users", "scripts", "jobs", "alembic_version"})
+
+# PostgreSQL system prefixes that destination tables may not use
+_RESERVED_PREFIXES = ("pg_", "sql_", "information_schema")
+
+# Only allow alphanumeric and underscore, starting with letter
+_TABLE_NAME_RE = re.compile(r"[a-zA-Z][a-zA-Z0-9_]{0,62}\Z")
+_COLUMN_NAME_RE = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]{0,62}\Z")
+
+# Planner row estimate; -1 (or 0) until the table is first analyzed
+_ROW_ESTIMATE_QUERY = """
+    SELECT reltuples::bigint
+    FROM pg_catalog.pg_class
+    WHERE oid = to_regclass(format('%I.%I', 'public', :table_name))
+"""
+
+# Rows per CSV buffer streamed through COPY, bounding peak memory
+COPY_CHUNK_ROWS = 100_000
+
+# Connections one job holds at once: the chunk reader's server-side
+# cursor plus the writer. Each pool process runs one job at a time.
+ENGINE_POOL_SIZE = 2
+
+
+def _copy_csv(rows: Iterable[tuple]) -> str:
+    """
+    Serialize rows as CSV text for COPY.
+
+    Every non-null value is quoted and None is written as an empty unquoted
+    field, the only form COPY's CSV format reads as NULL. Empty strings and
+    a literal \\N therefore arrive as text.
+    """
+    return "".join(
+        ",".join(
+            "" if value is None else '"' + str(value).replace('"', '""') + '"'
+            for value in row
+        )
+        + "\n"
+        for row in rows
+    )
+
+
+def copy_insert(table, conn, keys, data_iter) -> int:
+    """
+    pandas to_sql insert method that streams rows through COPY FROM STDIN.
+
+    to_sql still creates (or replaces) the table from the full DataFrame,
+    so column types are inferred as usual; only the row inserts go
+    through COPY instead of INSERT batches.
+
+    Returns:
+        Number of rows copied
+    """
+    columns = ", ".join(f'"{key}"' for key in keys)
+    table_name = f'"{table.schema}"."{table.name}"' if table.schema else f'"{table.name}"'
+    buffer = io.StringIO(_copy_csv(data_iter))
+    with conn.connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {table_name} ({columns}) FROM STDIN WITH (FORMAT CSV)", buffer
+        )
+        return cursor.rowcount
+
+
+@functools.lru_cache(maxsize=1)
+def _get_engine() -> Engine:
+    """Return the process-wide sync engine shared by every DataHandler."""
+    return create_engine(
+        settings.SYNC_DATABASE_URL,
+        # Fail fast on a leaked connection rather than queue behind it
+        pool_size=ENGINE_POOL_SIZE,
+        max_overflow=0,
+        pool_timeout=5,
+        pool_pre_ping=True,
+        # Replace connections before server-side idle timeouts drop them
+        pool_recycle=1800,
+    )
 
 
 class DataHandler:
@@ -23,13 +105,11 @@ class DataHandler:
     Uses sync SQLAlchemy engine for pandas compatibility.
     """
 
+    # Columns of the last DataFrame that passed validation
+    _validated_columns: Tuple = ()
+
     def __init__(self):
-        self.engine = create_engine(
-            settings.SYNC_DATABASE_URL,
-            pool_size=5,
-            max_overflow=10,
-            pool_pre_ping=True,
-        )
+        self.engine = _get_engine()
 
     def load_table(self, table_name: str) -> pd.DataFrame:
         """
@@ -45,27 +125,50 @@ class DataHandler:
             raise ValueError(f"Invalid table name: {table_name}")
 
         query = f'SELECT * FROM "{table_name}"'
+        if cx is not None:
+            # Builds columns from Arrow buffers instead of Python row tuples
+            url = make_url(settings.SYNC_DATABASE_URL).set(drivername="postgresql")
+            return cx.read_sql(
+                url.render_as_string(hide_password=False), query, return_type="pandas"
+            )
         return pd.read_sql(query, self.engine)
 
-    def load_table_chunk(
-        self, table_name: str, chunk_size: int, offset: int
-    ) -> pd.DataFrame:
+    def iter_table_chunks(
+        self, table_name: str, chunk_size: int
+    ) -> Iterator[pd.DataFrame]:
         """
-        Load a chunk of table data.
+        Stream a table as DataFrame chunks through a server-side cursor.
+
+        The query runs once and rows are fetched chunk by chunk, so each
+        chunk costs O(chunk_size) instead of re-scanning an OFFSET.
 
         Args:
             table_name: Source table name
-            chunk_size: Number of rows to load
-            offset: Starting row offset
+            chunk_size: Number of rows per chunk
 
-        Returns:
-            DataFrame with chunk data
+        Yields:
+            DataFrame for each chunk, in table order
         """
         if not self.is_valid_table_name(table_name):
             raise ValueError(f"Invalid table name: {table_name}")
 
-        query = f'SELECT * FROM "{table_name}" LIMIT {chunk_size} OFFSET {offset}'
-        return pd.read_sql(query, self.engine)
+        conn = self.engine.raw_connection()
+        try:
+            # A named cursor is server-side in psycopg2
+            with conn.cursor(name="job_stream") as cursor:
+                cursor.itersize = chunk_size
+                cursor.execute(f'SELECT * FROM "{table_name}"')
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    columns = [column[0] for column in cursor.description]
+                    yield pd.DataFrame.from_records(
+                        rows, columns=columns, coerce_float=True
+                    )
+        finally:
+            # Returning the connection to the pool rolls back the read
+            conn.close()
 
     def get_row_count(self, table_name: str) -> int:
         """
@@ -84,6 +187,32 @@ class DataHandler:
             result = conn.execute(text(f'SELECT COUNT(*) FROM "{table_name}"'))
             return result.scalar() or 0
 
+    def estimate_row_count(self, table_name: str) -> int:
+        """
+        Get the planner's row estimate for a table.
+
+        Reads pg_class.reltuples instead of scanning the table, and falls
+        back to an exact count when the table has not been analyzed yet.
+
+        Args:
+            table_name: Table name
+
+        Returns:
+            Approximate number of rows
+        """
+        if not self.is_valid_table_name(table_name):
+            raise ValueError(f"Invalid table name: {table_name}")
+
+        with self.engine.connect() as conn:
+            result = conn.execute(
+                text(_ROW_ESTIMATE_QUERY), {"table_name": table_name}
+            )
+            estimate = result.scalar()
+
+        if estimate is None or estimate <= 0:
+            return self.get_row_count(table_name)
+        return estimate
+
     def write_dataframe(
         self,
         df: pd.DataFrame,
@@ -117,24 +246,56 @@ class DataHandler:
                 f"Output exceeds maximum rows ({len(df):,} > {settings.SANDBOX_MAX_OUTPUT_ROWS:,})"
             )
 
-        # Validate column names
-        for col in df.columns:
-            if not self.is_valid_column_name(str(col)):
-                raise ValueError(f"Invalid column name: {col}")
-
-        # Write DataFrame
-        rows_written = df.to_sql(
-            table_name,
-            self.engine,
-            if_exists=if_exists,
-            index=False,
-            method="multi",
-            chunksize=10000,
-        )
+        # Validate column names. Chunks of a job share their columns, so
+        # only a column set that differs from the last valid one is checked.
+        columns = tuple(df.columns)
+        if columns != self._validated_columns:
+            column_match = _COLUMN_NAME_RE.match
+            for col in columns:
+                if column_match(str(col)) is None:
+                    raise ValueError(f"Invalid column name: {col}")
+            self._validated_columns = columns
+
+        if settings.WRITE_DOWNCAST_FLOATS:
+            df = self._downcast(df)
+
+        # Create (or replace) the table from the full DataFrame, so types of
+        # object columns are inferred from their values, then stream the rows
+        # through COPY in slices of COPY_CHUNK_ROWS in the same transaction
+        with self.engine.begin() as conn:
+            df.to_sql(
+                table_name,
+                conn,
+                if_exists=if_exists,
+                index=False,
+                method=copy_insert,
+                chunksize=COPY_CHUNK_ROWS,
+            )
 
         logger.info(f"Wrote {len(df)} rows to table '{table_name}'")
         return len(df)
 
+    @staticmethod
+    def _downcast(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Narrow float64 columns to float32 before writing.
+
+        Shortens every float in the COPY stream and creates REAL columns.
+        Integers are left alone: their text is the same at any width, and
+        narrowing them would fix a column type from the first chunk that
+        later chunks may overflow.
+
+        Args:
+            df: DataFrame to write
+
+        Returns:
+            DataFrame with float64 columns as float32
+        """
+        floats = df.select_dtypes(include=["float64"]).columns
+        if floats.empty:
+            return df
+        return df.astype({col: "float32" for col in floats})
+
     def table_exists(self, table_name: str) -> bool:
         """
         Check if a table exists in the database.
@@ -171,9 +332,7 @@ class DataHandler:
         Returns:
             True if valid
         """
-        # Only allow alphanumeric and underscore, starting with letter
-        pattern = r"^[a-zA-Z][a-zA-Z0-9_]{0,62}$"
-        return bool(re.match(pattern, name))
+        return _TABLE_NAME_RE.match(name) is not None
 
     @staticmethod
     def is_valid_destination_table(name: str) -> bool:
@@ -186,16 +345,11 @@ class DataHandler:
         if not DataHandler.is_valid_table_name(name):
             return False
 
-        # Block system table names
-        if name.lower() in SYSTEM_TABLES:
-            return False
-
-        # Block PostgreSQL system prefixes
-        reserved_prefixes = ("pg_", "sql_", "information_schema")
-        if name.lower().startswith(reserved_prefixes):
-            return False
-
-        return True
+        # Block system table names and PostgreSQL system prefixes
+        lowered = name.lower()
+        return lowered not in SYSTEM_TABLES and not lowered.startswith(
+            _RESERVED_PREFIXES
+        )
 
     @staticmethod
     def is_valid_column_name(name: str) -> bool:
@@ -208,5 +362,4 @@ class DataHandler:
         Returns:
             True if valid
         """
-        pattern = r"^[a-zA-Z_][a-zA-Z0-9_]{0,62}$"
-        return bool(re.match(pattern, name))
+        return _COLUMN_NAME_RE.match(name) is not None
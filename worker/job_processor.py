@@ -1,15 +1,18 @@
 """Job processor - executes transformation jobs with chunking support."""
 
 import asyncio
+import functools
+import io
 import logging
-from datetime import datetime
-from typing import Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
-from app.database import AsyncSessionLocal
+from app.database import AsyncSessionLocal, engine
 from app.models.job import Job, JobStatus
 from app.models.script import Script
 from sandbox.executor import SandboxExecutor
@@ -19,6 +22,55 @@ from worker.queue_manager import QueueManager
 settings = get_settings()
 logger = logging.getLogger("worker")
 
+# Chunks buffered between pipeline stages in _process_chunked
+PIPELINE_DEPTH = 2
+
+# Progress is written at most this often, or every N chunks, and carries
+# only the log text added since the previous write
+PROGRESS_INTERVAL_SECONDS = 2.0
+PROGRESS_EVERY_CHUNKS = 10
+
+# Last second formatted by JobProcessor._timestamp, and its text
+_ts_second = -1
+_ts_prefix = ""
+
+
+class LogBuffer:
+    """
+    Job log that is built incrementally instead of re-joined per write.
+
+    Entries go into one growing text buffer for the full log. Progress
+    updates send only the text added since the previous update.
+    """
+
+    def __init__(self):
+        self._buf = io.StringIO()
+        # Length of the log already sent with a progress update
+        self._saved = 0
+
+    def append(self, entry: str):
+        """Add an entry; entries are newline separated."""
+        if self._buf.tell():
+            self._buf.write("\n")
+        self._buf.write(entry)
+
+    def snapshot(self) -> str:
+        """Return the full log."""
+        return self._buf.getvalue()
+
+    def unsaved(self) -> Tuple[int, str]:
+        """
+        Return the text added since the last call and the offset it starts at.
+
+        The stored log is extended rather than replaced, so offsets that
+        clients poll from stay valid as the job runs.
+        """
+        offset = self._saved
+        self._buf.seek(offset)
+        text = self._buf.read()
+        self._saved = self._buf.tell()
+        return offset, text
+
 
 class JobProcessor:
     """
@@ -46,7 +98,7 @@ class JobProcessor:
             True if successful, False otherwise
         """
         logger.info(f"Processing job {job_id}")
-        all_logs = []
+        all_logs = LogBuffer()
 
         try:
             # Load job and script
@@ -67,15 +119,28 @@ class JobProcessor:
                 destination_table = job.destination_table
                 code = script.code_text
 
-            # Mark as running
-            await self.queue_manager.mark_job_running(job_id)
+            # The job was marked running when the worker claimed it
             all_logs.append(f"[{self._timestamp()}] Job started")
             all_logs.append(f"[{self._timestamp()}] Source: {source_table}")
             all_logs.append(f"[{self._timestamp()}] Destination: {destination_table}")
 
-            # Get row count
-            row_count = self.data_handler.get_row_count(source_table)
-            all_logs.append(f"[{self._timestamp()}] Source table has {row_count:,} rows")
+            # Rejected at submission; guards jobs queued before that check.
+            # Replacing the table being streamed would block on our own read.
+            if destination_table == source_table:
+                all_logs.append(
+                    f"[{self._timestamp()}] ERROR: destination is the source table"
+                )
+                await self.queue_manager.mark_job_failed(
+                    job_id,
+                    "Destination table must differ from the source table",
+                    all_logs.snapshot(),
+                )
+                return False
+
+            # Estimate row count; only used to pick the processing path and
+            # for display, since the chunk loop runs until the table ends
+            row_count = self.data_handler.estimate_row_count(source_table)
+            all_logs.append(f"[{self._timestamp()}] Source table has ~{row_count:,} rows")
 
             # Process with chunking for large tables
             if row_count > settings.CHUNK_SIZE:
@@ -93,7 +158,7 @@ class JobProcessor:
             logger.exception(f"Job {job_id} failed with exception")
             all_logs.append(f"[{self._timestamp()}] EXCEPTION: {str(e)}")
             await self.queue_manager.mark_job_failed(
-                job_id, str(e), "\n".join(all_logs)
+                job_id, str(e), all_logs.snapshot()
             )
             return False
 
@@ -103,7 +168,7 @@ class JobProcessor:
         code: str,
         source_table: str,
         destination_table: str,
-        logs: list,
+        logs: LogBuffer,
     ) -> bool:
         """Process entire table at once (for small tables)."""
 
@@ -120,7 +185,7 @@ class JobProcessor:
 
         if not success:
             await self.queue_manager.mark_job_failed(
-                job_id, "Transformation failed", "\n".join(logs)
+                job_id, "Transformation failed", logs.snapshot()
             )
             return False
 
@@ -138,7 +203,7 @@ class JobProcessor:
 
         # Mark complete
         await self.queue_manager.mark_job_completed(
-            job_id, rows_written, "\n".join(logs)
+            job_id, rows_written, logs.snapshot()
         )
 
         logger.info(f"Job {job_id} completed: {rows_written} rows")
@@ -151,74 +216,180 @@ class JobProcessor:
         source_table: str,
         destination_table: str,
         total_rows: int,
-        logs: list,
+        logs: LogBuffer,
     ) -> bool:
-        """Process large table in chunks."""
-
-        logs.append(
-            f"[{self._timestamp()}] Processing in chunks of {settings.CHUNK_SIZE:,} rows"
-        )
+        """
+        Process large table in chunks.
 
-        offset = 0
-        chunk_num = 0
-        total_rows_processed = 0
-        first_chunk = True
+        Loading, sandbox execution and writing run as three pipelined
+        stages connected by bounded queues, so chunk N+1 loads while chunk
+        N executes and chunk N-1 is written. The blocking database and
+        sandbox calls run on worker threads.
 
-        while offset < total_rows:
-            chunk_num += 1
+        Up to SANDBOX_PARALLEL_CHUNKS chunks execute at once, each in its
+        own runner subprocess. Results are still written in source order.
+        """
 
-            # Check for cancellation
-            if await self.queue_manager.check_job_cancelled(job_id):
-                logs.append(f"[{self._timestamp()}] Job cancelled by user")
-                return False
+        logs.append(
+            f"[{self._timestamp()}] Processing ~{total_rows:,} rows in chunks of "
+            f"{settings.CHUNK_SIZE:,} rows"
+        )
 
-            logs.append(
-                f"[{self._timestamp()}] Processing chunk {chunk_num} "
-                f"(rows {offset:,}-{min(offset + settings.CHUNK_SIZE, total_rows):,})"
-            )
+        parallel = max(1, settings.SANDBOX_PARALLEL_CHUNKS)
+        executors = [SandboxExecutor(job_id, slot=slot) for slot in range(parallel)]
 
-            # Load chunk
-            df_chunk = self.data_handler.load_table_chunk(
-                source_table, settings.CHUNK_SIZE, offset
+        # Compile once; every chunk runs the same prepared code
+        prepared, error = executors[0].prepare(code)
+        if error:
+            logs.append(f"[{self._timestamp()}] COMPILATION ERROR: {error}")
+            await self.queue_manager.mark_job_failed(
+                job_id, "Transformation failed", logs.snapshot()
             )
+            return False
 
-            if df_chunk.empty:
-                break
+        loop = asyncio.get_running_loop()
+        # Bounded queues give backpressure: at most a few chunks in memory
+        load_queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_DEPTH)
+        write_queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_DEPTH)
+        # Executors not currently running a chunk
+        idle: asyncio.Queue = asyncio.Queue()
+        for executor in executors:
+            idle.put_nowait(executor)
+        running = set()
+        chunk_num = 0
+        total_rows_processed = 0
 
-            logs.append(f"[{self._timestamp()}] Loaded {len(df_chunk):,} rows")
+        chunks = self.data_handler.iter_table_chunks(source_table, settings.CHUNK_SIZE)
+        # One thread per loader, writer and executor, so all can block at once
+        threads = ThreadPoolExecutor(
+            max_workers=parallel + 2, thread_name_prefix=f"job-{job_id}"
+        )
 
-            # Execute transformation
-            executor = SandboxExecutor(job_id)
-            success, result_df, exec_logs = executor.execute(code, df_chunk)
-            logs.append(exec_logs)
+        async def run_chunk(executor: SandboxExecutor, df_chunk):
+            try:
+                return await loop.run_in_executor(
+                    threads, executor.run, prepared, df_chunk
+                )
+            finally:
+                idle.put_nowait(executor)
+
+        async def load_stage() -> bool:
+            # None marks the end of the table
+            while True:
+                df_chunk = await loop.run_in_executor(threads, next, chunks, None)
+                await load_queue.put(df_chunk)
+                if df_chunk is None:
+                    return True
+
+        async def execute_stage() -> bool:
+            nonlocal chunk_num
+            offset = 0
+            while True:
+                df_chunk = await load_queue.get()
+                if df_chunk is None:
+                    await write_queue.put(None)
+                    return True
+                chunk_num += 1
+
+                # Check for cancellation
+                if await self.queue_manager.check_job_cancelled(job_id):
+                    logs.append(f"[{self._timestamp()}] Job cancelled by user")
+                    return False
 
-            if not success:
-                await self.queue_manager.mark_job_failed(
-                    job_id,
-                    f"Transformation failed on chunk {chunk_num}",
-                    "\n".join(logs),
+                logs.append(
+                    f"[{self._timestamp()}] Processing chunk {chunk_num} "
+                    f"(rows {offset:,}-{offset + len(df_chunk):,})"
                 )
-                return False
+                offset += len(df_chunk)
+
+                # Execute transformation; waits while every executor is busy
+                executor = await idle.get()
+                task = asyncio.create_task(run_chunk(executor, df_chunk))
+                running.add(task)
+                task.add_done_callback(running.discard)
+                await write_queue.put((chunk_num, task))
+
+        async def write_stage() -> bool:
+            nonlocal total_rows_processed
+            first_chunk = True
+            last_progress = 0.0
+            while True:
+                item = await write_queue.get()
+                if item is None:
+                    return True
+                written_chunk, task = item
+
+                # Chunks finish in any order but are written in source order
+                success, result_df, exec_logs = await task
+                logs.append(exec_logs)
+
+                if not success:
+                    await self.queue_manager.mark_job_failed(
+                        job_id,
+                        f"Transformation failed on chunk {written_chunk}",
+                        logs.snapshot(),
+                    )
+                    return False
 
-            # Write chunk (replace first, append rest)
-            if_exists = "replace" if first_chunk else "append"
-            rows_written = self.data_handler.write_dataframe(
-                result_df, destination_table, if_exists=if_exists
-            )
+                # Write chunk (replace first, append rest)
+                if_exists = "replace" if first_chunk else "append"
+                rows_written = await loop.run_in_executor(
+                    threads,
+                    functools.partial(
+                        self.data_handler.write_dataframe,
+                        result_df,
+                        destination_table,
+                        if_exists=if_exists,
+                    ),
+                )
+                total_rows_processed += rows_written
+                first_chunk = False
 
-            total_rows_processed += rows_written
-            first_chunk = False
-            offset += settings.CHUNK_SIZE
+                logs.append(
+                    f"[{self._timestamp()}] Chunk {written_chunk} complete: "
+                    f"{rows_written:,} rows written"
+                )
 
-            # Update progress
-            await self.queue_manager.update_job_progress(
-                job_id, total_rows_processed, "\n".join(logs)
-            )
+                # Update progress, throttled
+                now = time.monotonic()
+                if (
+                    now - last_progress >= PROGRESS_INTERVAL_SECONDS
+                    or written_chunk % PROGRESS_EVERY_CHUNKS == 0
+                ):
+                    last_progress = now
+                    log_offset, new_logs = logs.unsaved()
+                    await self.queue_manager.update_job_progress(
+                        job_id,
+                        total_rows_processed,
+                        new_logs,
+                        log_offset,
+                    )
 
-            logs.append(
-                f"[{self._timestamp()}] Chunk {chunk_num} complete: "
-                f"{rows_written:,} rows written"
-            )
+        pending = {
+            asyncio.create_task(stage())
+            for stage in (load_stage, execute_stage, write_stage)
+        }
+        try:
+            # Stop as soon as any stage fails; result() re-raises exceptions
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not all(task.result() for task in done):
+                    return False
+        finally:
+            pending |= running
+            for task in pending:
+                task.cancel()
+            # Cancelling a task does not stop its sandbox, so kill the
+            # runners still executing; a no-op once every chunk has finished
+            for executor in executors:
+                executor.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            # Let in-flight thread calls finish before releasing the cursor,
+            # without blocking the event loop while they do
+            await loop.run_in_executor(None, threads.shutdown)
+            chunks.close()
 
         # Mark complete
         logs.append(
@@ -226,7 +397,7 @@ class JobProcessor:
             f"{total_rows_processed:,} total rows"
         )
         await self.queue_manager.mark_job_completed(
-            job_id, total_rows_processed, "\n".join(logs)
+            job_id, total_rows_processed, logs.snapshot()
         )
 
         logger.info(f"Job {job_id} completed: {total_rows_processed} rows in {chunk_num} chunks")
@@ -246,16 +417,49 @@ class JobProcessor:
 
     @staticmethod
     def _timestamp() -> str:
-        """Get formatted timestamp for logs."""
-        return datetime.now().strftime("%H:%M:%S.%f")[:-3]
+        """
+        Get formatted timestamp for logs (local HH:MM:SS.mmm).
+
+        The seconds part is formatted once per second and reused.
+        """
+        global _ts_second, _ts_prefix
+        now = time.time()
+        second = int(now)
+        if second != _ts_second:
+            _ts_prefix = time.strftime("%H:%M:%S", time.localtime(second))
+            _ts_second = second
+        return f"{_ts_prefix}.{int(now * 1000) % 1000:03d}"
+
+
+# Per-process state for pool workers, set up by init_worker()
+_processor: Optional[JobProcessor] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def init_worker():
+    """
+    Initialize a worker pool process.
+
+    Creates one JobProcessor (and with it one DataHandler engine) and one
+    event loop that every job in this process reuses. Async engine
+    connections are bound to the loop they were opened on, so a fresh
+    loop per job could not reuse them. Connections inherited from the
+    parent process are dropped without being closed.
+    """
+    global _processor, _loop
+    engine.sync_engine.dispose(close=False)
+    _loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_loop)
+    _processor = JobProcessor()
 
 
 def process_job_sync(job_id: int) -> bool:
     """
     Synchronous wrapper for multiprocessing.
 
-    This function is called by the multiprocessing pool and
-    runs the async process method in a new event loop.
+    This function is called by the multiprocessing pool and runs the
+    async process method on the worker's persistent event loop.
     """
-    processor = JobProcessor()
-    return asyncio.run(processor.process(job_id))
+    if _processor is None:
+        init_worker()
+    return _loop.run_until_complete(_processor.process(job_id))
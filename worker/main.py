@@ -8,15 +8,17 @@ import asyncio
 import logging
 import signal
 import sys
+import time
 from multiprocessing import Pool, cpu_count
 from pathlib import Path
+from typing import Optional
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.config import get_settings
 from app.core.logging_config import setup_worker_logging
-from worker.job_processor import process_job_sync
+from worker.job_processor import init_worker, process_job_sync
 from worker.queue_manager import QueueManager
 
 settings = get_settings()
@@ -35,6 +37,11 @@ class Worker:
         self.running = True
         self.queue_manager = QueueManager()
         self.active_jobs: dict = {}
+        # Set by job notifications, finished jobs and shutdown
+        self.wakeup: Optional[asyncio.Event] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.listener = None
+        self.listener_retry_at = 0.0
 
     async def run(self):
         """Main worker loop."""
@@ -47,6 +54,9 @@ class Worker:
         logger.info(f"Chunk size: {settings.CHUNK_SIZE:,} rows")
         logger.info("=" * 50)
 
+        self.loop = asyncio.get_running_loop()
+        self.wakeup = asyncio.Event()
+
         # Setup signal handlers for graceful shutdown
         self._setup_signal_handlers()
 
@@ -54,8 +64,9 @@ class Worker:
         max_workers = min(settings.MAX_CONCURRENT_JOBS, cpu_count())
         logger.info(f"Starting process pool with {max_workers} workers")
 
-        # Create process pool
-        with Pool(processes=max_workers) as pool:
+        # Create process pool; each process keeps its engines and event
+        # loop for its whole lifetime
+        with Pool(processes=max_workers, initializer=init_worker) as pool:
             while self.running:
                 try:
                     await self._poll_and_process(pool, max_workers)
@@ -63,6 +74,9 @@ class Worker:
                     logger.error(f"Worker error: {e}", exc_info=True)
                     await asyncio.sleep(5)  # Back off on error
 
+        if self.listener is not None:
+            await self.listener.close()
+        await self.queue_manager.close()
         logger.info("Worker stopped")
 
     async def _poll_and_process(self, pool: Pool, max_workers: int):
@@ -75,8 +89,8 @@ class Worker:
         available_slots = max_workers - len(self.active_jobs)
 
         if available_slots > 0:
-            # Get pending jobs
-            jobs = await self.queue_manager.get_pending_jobs(limit=available_slots)
+            # Claim pending jobs; they come back already marked running
+            jobs = await self.queue_manager.claim_pending_jobs(limit=available_slots)
 
             if jobs:
                 logger.info(f"Found {len(jobs)} pending job(s)")
@@ -85,9 +99,6 @@ class Worker:
                     if len(self.active_jobs) >= max_workers:
                         break
 
-                    # Mark job as running before dispatching
-                    await self.queue_manager.mark_job_running(job.id)
-
                     # Submit to pool
                     result = pool.apply_async(
                         process_job_sync,
@@ -99,8 +110,57 @@ class Worker:
                     self.active_jobs[job.id] = result
                     logger.info(f"Dispatched job {job.id} to worker pool")
 
-        # Wait before next poll
-        await asyncio.sleep(settings.WORKER_POLL_INTERVAL)
+        await self._wait_for_work()
+
+    async def _wait_for_work(self):
+        """
+        Sleep until a job is inserted or a running job finishes.
+
+        Falls back to polling every WORKER_POLL_INTERVAL while no LISTEN
+        connection is available, including when the notify trigger is
+        missing from the database.
+        """
+        if not await self._ensure_listener():
+            await asyncio.sleep(settings.WORKER_POLL_INTERVAL)
+            return
+
+        try:
+            await asyncio.wait_for(
+                self.wakeup.wait(), timeout=settings.WORKER_FALLBACK_POLL_SECONDS
+            )
+        except asyncio.TimeoutError:
+            pass
+        # Cleared only after waking, so a notification that arrives while
+        # jobs are being claimed triggers another pass
+        self.wakeup.clear()
+
+    async def _ensure_listener(self) -> bool:
+        """Open the LISTEN connection if needed; False if unavailable."""
+        if self.listener is not None and not self.listener.is_closed():
+            return True
+        if time.monotonic() < self.listener_retry_at:
+            return False
+
+        try:
+            self.listener = await self.queue_manager.listen_for_new_jobs(
+                self.wakeup.set
+            )
+            logger.info("Listening for new job notifications")
+            return True
+        except Exception as e:
+            logger.warning(f"Job notifications unavailable, polling instead: {e}")
+            self.listener = None
+            self.listener_retry_at = time.monotonic() + 60
+            return False
+
+    def _wake(self):
+        """Wake the main loop; safe to call from pool and signal handlers."""
+        if self.loop is None:
+            return
+        try:
+            self.loop.call_soon_threadsafe(self.wakeup.set)
+        except RuntimeError:
+            pass  # Loop already closed during shutdown
 
     def _cleanup_completed(self):
         """Remove completed jobs from active tracking."""
@@ -116,10 +176,13 @@ class Worker:
         """Callback when job completes."""
         status = "SUCCESS" if success else "FAILED"
         logger.debug(f"Job completed with status: {status}")
+        # A slot is free again
+        self._wake()
 
     def _job_error_callback(self, error: Exception):
         """Callback when job raises exception."""
         logger.error(f"Job raised exception: {error}")
+        self._wake()
 
     def _setup_signal_handlers(self):
         """Setup handlers for graceful shutdown."""
@@ -127,6 +190,7 @@ class Worker:
         def signal_handler(signum, frame):
             logger.info(f"Received signal {signum}, initiating shutdown...")
             self.running = False
+            self._wake()
 
         # Handle SIGINT (Ctrl+C) and SIGTERM
         signal.signal(signal.SIGINT, signal_handler)
@@ -1,50 +1,135 @@
 """Job queue manager - polls PostgreSQL for pending jobs."""
 
+import asyncio
 import logging
-from datetime import datetime
-from typing import List, Optional
+from typing import Callable, List, Optional
 
-from sqlalchemy import select, update
-from sqlalchemy.ext.asyncio import AsyncSession
+import asyncpg
+from sqlalchemy import func, make_url, select, update
 
+from app.config import get_settings
 from app.database import AsyncSessionLocal
 from app.models.job import Job, JobStatus
 
+settings = get_settings()
 logger = logging.getLogger("worker")
 
+# Channel notified by the jobs insert trigger (see the notify migration)
+JOBS_CHANNEL = "jobs_new"
+JOBS_TRIGGER = "jobs_notify_insert"
+
+
+def _asyncpg_dsn() -> str:
+    """Return DATABASE_URL in the plain postgresql:// form asyncpg expects."""
+    url = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+def _rows_affected(status: str) -> int:
+    """Parse the row count from a command tag such as 'UPDATE 1'."""
+    return int(status.rsplit(" ", 1)[-1])
+
 
 class QueueManager:
     """
-    Manages job queue by polling PostgreSQL.
+    Manages job queue in PostgreSQL.
 
     This is a simpler alternative to Redis/RQ that works well
-    for the target scale of 10-15 concurrent users.
+    for the target scale of 10-15 concurrent users. New jobs are
+    announced with NOTIFY, so idle workers need not poll.
+
+    Claiming and loading jobs goes through the ORM. The small status and
+    progress updates made while a job runs go through a shared asyncpg
+    pool instead, skipping session setup and statement compilation.
     """
 
-    async def get_pending_jobs(self, limit: int = 4) -> List[Job]:
+    def __init__(self):
+        self._pg: Optional[asyncpg.Pool] = None
+        self._pg_lock = asyncio.Lock()
+
+    async def _pool(self) -> asyncpg.Pool:
+        """Return the asyncpg pool, creating it on first use."""
+        if self._pg is None:
+            async with self._pg_lock:
+                if self._pg is None:
+                    self._pg = await asyncpg.create_pool(
+                        _asyncpg_dsn(), min_size=1, max_size=4
+                    )
+        return self._pg
+
+    async def close(self):
+        """Close the asyncpg pool, if one was opened."""
+        if self._pg is not None:
+            await self._pg.close()
+            self._pg = None
+
+    async def listen_for_new_jobs(
+        self, on_new_job: Callable[[], None]
+    ) -> asyncpg.Connection:
         """
-        Get pending jobs from the database.
+        Open a connection that LISTENs for newly inserted jobs.
 
         Args:
-            limit: Maximum number of jobs to fetch
+            on_new_job: Called on the event loop for every new job
 
         Returns:
-            List of pending Job objects
+            The listening connection; close it to stop listening
+
+        Raises:
+            RuntimeError: If the jobs insert trigger does not exist, since
+                LISTEN would then succeed but never be notified
         """
+        conn = await asyncpg.connect(_asyncpg_dsn())
+        try:
+            has_trigger = await conn.fetchval(
+                "SELECT EXISTS (SELECT 1 FROM pg_trigger "
+                "WHERE tgrelid = to_regclass('jobs') AND tgname = $1)",
+                JOBS_TRIGGER,
+            )
+            if not has_trigger:
+                raise RuntimeError(f"trigger {JOBS_TRIGGER} is missing on jobs")
+            await conn.add_listener(JOBS_CHANNEL, lambda *args: on_new_job())
+        except BaseException:
+            await conn.close()
+            raise
+        return conn
+
+    async def claim_pending_jobs(self, limit: int = 4) -> List[Job]:
+        """
+        Atomically claim pending jobs by marking them running.
+
+        Pending rows are locked with FOR UPDATE SKIP LOCKED and updated in
+        the same statement, so concurrent workers never claim the same job.
+        The subquery is served by the partial index ix_jobs_pending_created_at;
+        keep its filter and ordering in line with that index.
+
+        Args:
+            limit: Maximum number of jobs to claim
+
+        Returns:
+            List of claimed Job objects, oldest first
+        """
+        pending = (
+            select(Job.id)
+            .where(Job.status == JobStatus.PENDING)
+            .order_by(Job.created_at.asc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
         async with AsyncSessionLocal() as db:
             result = await db.execute(
-                select(Job)
-                .where(Job.status == JobStatus.PENDING)
-                .order_by(Job.created_at.asc())
-                .limit(limit)
+                update(Job)
+                .where(Job.id.in_(pending))
+                .values(status=JobStatus.RUNNING, started_at=func.now())
+                .returning(Job)
+                .execution_options(synchronize_session=False)
             )
             jobs = list(result.scalars().all())
+            await db.commit()
 
-            # Detach jobs from session for use in worker
-            for job in jobs:
-                await db.refresh(job)
-
-            return jobs
+        # RETURNING does not preserve the subquery's order
+        jobs.sort(key=lambda job: job.created_at)
+        return jobs
 
     async def mark_job_running(self, job_id: int) -> bool:
         """
@@ -56,14 +141,13 @@ class QueueManager:
         Returns:
             True if updated, False if job not found
         """
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                update(Job)
-                .where(Job.id == job_id, Job.status == JobStatus.PENDING)
-                .values(status=JobStatus.RUNNING, started_at=datetime.utcnow())
-            )
-            await db.commit()
-            return result.rowcount > 0
+        pool = await self._pool()
+        status = await pool.execute(
+            "UPDATE jobs SET status = 'running', started_at = now() "
+            "WHERE id = $1 AND status = 'pending'",
+            job_id,
+        )
+        return _rows_affected(status) > 0
 
     async def mark_job_completed(
         self,
@@ -82,19 +166,15 @@ class QueueManager:
         Returns:
             True if updated, False if job not found
         """
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                update(Job)
-                .where(Job.id == job_id)
-                .values(
-                    status=JobStatus.COMPLETED,
-                    rows_processed=rows_processed,
-                    logs=logs,
-                    completed_at=datetime.utcnow(),
-                )
-            )
-            await db.commit()
-            return result.rowcount > 0
+        pool = await self._pool()
+        status = await pool.execute(
+            "UPDATE jobs SET status = 'completed', rows_processed = $2, "
+            "logs = $3, completed_at = now() WHERE id = $1",
+            job_id,
+            rows_processed,
+            logs,
+        )
+        return _rows_affected(status) > 0
 
     async def mark_job_failed(
         self,
@@ -115,45 +195,49 @@ class QueueManager:
         Returns:
             True if updated, False if job not found
         """
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                update(Job)
-                .where(Job.id == job_id)
-                .values(
-                    status=status,
-                    error_message=error_message,
-                    logs=logs,
-                    completed_at=datetime.utcnow(),
-                )
-            )
-            await db.commit()
-            return result.rowcount > 0
+        pool = await self._pool()
+        result = await pool.execute(
+            "UPDATE jobs SET status = $2, error_message = $3, logs = $4, "
+            "completed_at = now() WHERE id = $1",
+            job_id,
+            status.value,
+            error_message,
+            logs,
+        )
+        return _rows_affected(result) > 0
 
     async def update_job_progress(
         self,
         job_id: int,
         rows_processed: int,
-        logs: str,
+        new_logs: str,
+        log_offset: int,
     ) -> bool:
         """
         Update job progress during chunked processing.
 
+        The stored log is cut to log_offset characters and new_logs is
+        appended, so earlier log text is never rewritten.
+
         Args:
             job_id: Job ID to update
             rows_processed: Current number of rows processed
-            logs: Current execution logs
+            new_logs: Log text added since the previous update
+            log_offset: Length of the log already stored for this job
 
         Returns:
             True if updated, False if job not found
         """
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                update(Job)
-                .where(Job.id == job_id)
-                .values(rows_processed=rows_processed, logs=logs)
-            )
-            await db.commit()
-            return result.rowcount > 0
+        pool = await self._pool()
+        status = await pool.execute(
+            "UPDATE jobs SET rows_processed = $2, "
+            "logs = substr(coalesce(logs, ''), 1, $4) || $3 WHERE id = $1",
+            job_id,
+            rows_processed,
+            new_logs,
+            log_offset,
+        )
+        return _rows_affected(status) > 0
 
     async def get_job(self, job_id: int) -> Optional[Job]:
         """
@@ -179,9 +263,9 @@ class QueueManager:
         Returns:
             True if job is killed/cancelled
         """
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                select(Job.status).where(Job.id == job_id)
+        pool = await self._pool()
+        return bool(
+            await pool.fetchval(
+                "SELECT status = 'killed' FROM jobs WHERE id = $1", job_id
             )
-            status = result.scalar_one_or_none()
-            return status == JobStatus.KILLED
+        )